@@ -4,9 +4,20 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from .config import WEALTH_METRICS, COUNTRY_NAMES
+from .data_loader import stack_wealth_metrics, stack_covid_regressors
+from .visualization import grid_subplots, add_line_collection
 
+# Above this many heatmap cells in a figure, values are not written as text
+MAX_ANNOTATED_CELLS = 400
 
-def merge_wealth_covid(df_wealth, df_covid_quarterly, country_code, country_name):
+
+def merge_wealth_covid(
+    df_wealth,
+    df_covid_quarterly,
+    country_code,
+    country_name,
+    covid_cols=("cases_per_100k", "deaths_per_100k"),
+):
     """
     Merge wealth and COVID-19 data for a specific country.
 
@@ -20,6 +31,9 @@ def merge_wealth_covid(df_wealth, df_covid_quarterly, country_code, country_name
         Country code ('DE', 'FR', or 'SI')
     country_name : str
         Country name as it appears in COVID dataset
+    covid_cols : sequence of str
+        COVID-19 columns to carry over (e.g. add the summarize_indicators()
+        columns after merging them into the quarterly frame)
 
     Returns:
     --------
@@ -45,7 +59,7 @@ def merge_wealth_covid(df_wealth, df_covid_quarterly, country_code, country_name
     # Merge on DATE
     merged = pd.merge(
         wealth_country,
-        covid_country[["DATE", "cases_per_100k", "deaths_per_100k"]],
+        covid_country[["DATE"] + list(covid_cols)],
         on="DATE",
         how="inner",
     )
@@ -84,7 +98,130 @@ def calculate_correlations(merged):
     return correlations
 
 
-def plot_correlation_heatmap(merged_dict):
+def _masked_moments(weights, x, y):
+    """Weighted Pearson correlation along the time axis (axis=-1)."""
+    n = weights.sum(-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mx = (weights * x).sum(-1) / n
+        my = (weights * y).sum(-1) / n
+        dx = (x - mx[..., None]) * weights
+        dy = (y - my[..., None]) * weights
+        corr = (dx * dy).sum(-1) / np.sqrt((dx * dx).sum(-1) * (dy * dy).sum(-1))
+    return n, corr
+
+
+def lagged_covid_effects(
+    df_wealth,
+    df_covid_quarterly,
+    max_lag=4,
+    countries=None,
+    metrics=None,
+    covid_cols=("cases_per_100k", "deaths_per_100k"),
+    transform="diff",
+):
+    """
+    Distributed-lag analysis of wealth metrics against COVID-19 severity.
+
+    For every lag k = 0..max_lag, metric and country, regresses the wealth
+    metric at quarter t on the COVID-19 regressors at quarter t-k (plus an
+    intercept) and reports the lag-k correlation with each regressor. All
+    regressions are built as one lag-shifted design tensor and solved as a
+    single batch of normal equations.
+
+    Quarters before the first COVID-19 record count as zero cases/deaths;
+    quarters after the last record are left out.
+
+    Parameters:
+    -----------
+    df_wealth : DataFrame
+        Wealth data with a DATE column (quarter ends)
+    df_covid_quarterly : DataFrame
+        Output of aggregate_covid_quarterly()
+    max_lag : int, default=4
+        Largest lag in quarters
+    countries : dict, optional
+        Country code to COVID dataset name (defaults to COUNTRY_NAMES)
+    metrics : list, optional
+        Metric keys from WEALTH_METRICS (defaults to all)
+    covid_cols : sequence of str
+        COVID-19 regressors
+    transform : str, default='diff'
+        Wealth series used as response: 'diff' (quarter-on-quarter change),
+        'pct' (percentage change) or 'level'
+
+    Returns:
+    --------
+    DataFrame
+        One row per (lag, metric, country) with the number of observations,
+        intercept, a 'coef_<col>' and a 'corr_<col>' column per regressor
+    """
+    countries = COUNTRY_NAMES if countries is None else countries
+    codes = list(countries)
+    covid_cols = list(covid_cols)
+    dates, codes, metrics, Y = stack_wealth_metrics(df_wealth, codes, metrics)
+
+    X = stack_covid_regressors(
+        df_covid_quarterly, dates, [countries[code] for code in codes], covid_cols
+    )
+
+    if transform == "diff":
+        Y = np.concatenate([np.full_like(Y[:, :1], np.nan), np.diff(Y, axis=1)], axis=1)
+    elif transform == "pct":
+        Y = np.concatenate(
+            [np.full_like(Y[:, :1], np.nan), Y[:, 1:] / Y[:, :-1] - 1], axis=1
+        ) * 100
+    elif transform != "level":
+        raise ValueError(f"Unknown transform: {transform}")
+
+    # Lag-shifted design tensor: (lag, country, time, 1 + regressors)
+    n_lags, n_time = max_lag + 1, len(dates)
+    design = np.full((n_lags, len(codes), n_time, len(covid_cols) + 1), np.nan)
+    design[..., 0] = 1.0
+    for k in range(min(n_lags, n_time)):
+        design[k, :, k:, 1:] = X[:, : n_time - k]
+
+    # Observation weights per (lag, country, time, metric)
+    weights = (
+        ~np.isnan(design).any(-1)[..., None] & ~np.isnan(Y)[None]
+    ).astype("float64")
+    D = np.nan_to_num(design)
+    Yz = np.nan_to_num(Y)
+
+    # Batched normal equations: one (p x p) system per lag, country and metric
+    xtx = np.einsum("kctm,kctp,kctq->kcmpq", weights, D, D)
+    xty = np.einsum("kctm,kctp,ctm->kcmp", weights, D, Yz)
+    coef = (np.linalg.pinv(xtx) @ xty[..., None])[..., 0]
+    n_obs = weights.sum(axis=2)
+    coef[n_obs <= D.shape[-1]] = np.nan
+
+    # Correlations on the same samples: move time last for the moments
+    w_t = np.moveaxis(weights, 2, -1)
+    y_t = np.broadcast_to(np.moveaxis(Yz, 1, -1)[None], w_t.shape)
+    corr = {}
+    for p, col in enumerate(covid_cols):
+        x_t = np.broadcast_to(D[..., p + 1][:, :, None, :], w_t.shape)
+        corr[col] = _masked_moments(w_t, x_t, y_t)[1]
+
+    lag_idx, country_idx, metric_idx = np.meshgrid(
+        np.arange(n_lags), np.arange(len(codes)), np.arange(len(metrics)), indexing="ij"
+    )
+    result = pd.DataFrame(
+        {
+            "lag": lag_idx.ravel(),
+            "metric": np.asarray(metrics)[metric_idx.ravel()],
+            "country": np.asarray(codes)[country_idx.ravel()],
+            "n_obs": n_obs.ravel().astype(int),
+            "intercept": coef[..., 0].ravel(),
+        }
+    )
+    for p, col in enumerate(covid_cols):
+        result[f"coef_{col}"] = coef[..., p + 1].ravel()
+    for col in covid_cols:
+        result[f"corr_{col}"] = corr[col].ravel()
+    return result.sort_values(["metric", "country", "lag"], ignore_index=True)
+
+
+def plot_correlation_heatmap(merged_dict, ncols=3, annotate=None):
     """
     Create correlation heatmap visualizations for all countries.
 
@@ -95,23 +232,31 @@ def plot_correlation_heatmap(merged_dict):
     -----------
     merged_dict : dict
         Dictionary with country names as keys and merged DataFrames as values
+    ncols : int, default=3
+        Number of heatmaps per row
+    annotate : bool, optional
+        Write correlation values in the cells; by default only when the
+        figure has at most MAX_ANNOTATED_CELLS cells
     """
-    fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+    cols = [
+        "gini",
+        "median_wealth",
+        "mean_wealth",
+        "cases_per_100k",
+        "deaths_per_100k",
+    ]
+    if annotate is None:
+        annotate = len(merged_dict) * len(cols) ** 2 <= MAX_ANNOTATED_CELLS
+
+    fig, axes = grid_subplots(len(merged_dict), ncols=ncols, panel_size=(6, 5))
     fig.suptitle(
         "COVID-19 vs Wealth Metrics: Correlation Analysis",
         fontsize=16,
         fontweight="bold",
     )
 
-    for ax, (name, merged) in zip(axes.flatten(), merged_dict.items()):
+    for ax, (name, merged) in zip(axes, merged_dict.items()):
         # Select numeric columns for correlation
-        cols = [
-            "gini",
-            "median_wealth",
-            "mean_wealth",
-            "cases_per_100k",
-            "deaths_per_100k",
-        ]
         corr_matrix = merged[cols].corr()
 
         # Create heatmap
@@ -143,17 +288,10 @@ def plot_correlation_heatmap(merged_dict):
         plt.setp(ax.get_xticklabels(), rotation=45, ha="right", rotation_mode="anchor")
 
         # Add correlation values as text
-        for i in range(len(corr_matrix)):
-            for j in range(len(corr_matrix)):
-                ax.text(
-                    j,
-                    i,
-                    f"{corr_matrix.iloc[i, j]:.2f}",
-                    ha="center",
-                    va="center",
-                    color="black",
-                    fontsize=9,
-                )
+        if annotate:
+            values = corr_matrix.to_numpy()
+            for (i, j), value in np.ndenumerate(values):
+                ax.text(j, i, f"{value:.2f}", ha="center", va="center", fontsize=9)
 
         ax.set_title(name, fontweight="bold", fontsize=12)
 
@@ -170,7 +308,9 @@ def plot_correlation_heatmap(merged_dict):
     plt.show()
 
 
-def plot_wealth_distribution_comparison(df, title="Wealth Concentration"):
+def plot_wealth_distribution_comparison(
+    df, title="Wealth Concentration", countries=None, ncols=3
+):
     """
     Compare wealth distribution metrics across countries.
 
@@ -180,44 +320,41 @@ def plot_wealth_distribution_comparison(df, title="Wealth Concentration"):
         Full wealth dataset
     title : str
         Title for the visualization
+    countries : dict, optional
+        Country code to display name (defaults to COUNTRY_NAMES)
+    ncols : int, default=3
+        Number of panels per row
     """
-    fig, axes = plt.subplots(1, 3, figsize=(18, 5))
-
-    for idx, (code, name) in enumerate(COUNTRY_NAMES.items()):
-        ax = axes[idx]
+    countries = COUNTRY_NAMES if countries is None else countries
+    fig, axes = grid_subplots(len(countries), ncols=ncols, panel_size=(6, 5))
+    fig.suptitle(title, fontsize=16, fontweight="bold")
 
+    dates = df["DATE"]
+    for ax, (code, name) in zip(axes, countries.items()):
         # Get the metric column names for this country
         top10_col = WEALTH_METRICS[code]["net_wealth_top10"]
         bottom50_col = WEALTH_METRICS[code]["net_wealth_bottom50"]
 
-        # Plot both segments
-        ax.plot(
-            df["DATE"],
-            df[top10_col] / 1e9,
-            label="Top 10%",
-            linewidth=2.5,
-            color="#d62728",
-            marker="o",
-            markersize=3,
-        )
-        ax.plot(
-            df["DATE"],
-            df[bottom50_col] / 1e9,
-            label="Bottom 50%",
+        # Plot both segments as one artist
+        handles = add_line_collection(
+            ax,
+            dates,
+            df[[top10_col, bottom50_col]].to_numpy().T / 1e9,
+            colors=["#d62728", "#1f77b4"],
+            labels=["Top 10%", "Bottom 50%"],
             linewidth=2.5,
-            color="#1f77b4",
-            marker="s",
-            markersize=3,
         )
 
         # Mark COVID-19 period
-        ax.axvline(
-            pd.Timestamp("2020-03-01"),
-            color="red",
-            linestyle="--",
-            alpha=0.5,
-            linewidth=1.5,
-            label="COVID-19 Start",
+        handles.append(
+            ax.axvline(
+                pd.Timestamp("2020-03-01"),
+                color="red",
+                linestyle="--",
+                alpha=0.5,
+                linewidth=1.5,
+                label="COVID-19 Start",
+            )
         )
         ax.axvspan(
             pd.Timestamp("2020-01-01"),
@@ -229,7 +366,7 @@ def plot_wealth_distribution_comparison(df, title="Wealth Concentration"):
         ax.set_title(f"{name}: Wealth by Segment", fontsize=14, fontweight="bold")
         ax.set_xlabel("Date", fontsize=11)
         ax.set_ylabel("Net Wealth (Billion EUR)", fontsize=11)
-        ax.legend(loc="upper left", fontsize=10)
+        ax.legend(handles=handles, loc="upper left", fontsize=10)
         ax.grid(True, alpha=0.3)
         ax.tick_params(axis="x", rotation=45)
 
@@ -237,7 +374,7 @@ def plot_wealth_distribution_comparison(df, title="Wealth Concentration"):
     plt.show()
 
 
-def calculate_wealth_concentration_ratios(df):
+def calculate_wealth_concentration_ratios(df, countries=None):
     """
     Calculate and visualize wealth concentration ratios for all countries.
 
@@ -245,38 +382,42 @@ def calculate_wealth_concentration_ratios(df):
     -----------
     df : DataFrame
         Full wealth dataset
+    countries : dict, optional
+        Country code to display name (defaults to COUNTRY_NAMES)
 
     Returns:
     --------
     dict
         Dictionary with country names and their concentration metrics
     """
-    results = {}
-    data_for_plot = []
-
-    for code, name in COUNTRY_NAMES.items():
-        top10_col = WEALTH_METRICS[code]["net_wealth_top10"]
-        bottom50_col = WEALTH_METRICS[code]["net_wealth_bottom50"]
-
-        # Pre-COVID average (2019)
-        pre_covid = df[df["DATE"].dt.year == 2019]
-        ratio_2019 = (pre_covid[top10_col] / pre_covid[bottom50_col]).mean()
-
-        # Post-COVID recent (2024)
-        post_covid = df[df["DATE"].dt.year == 2024]
-        ratio_2024 = (post_covid[top10_col] / post_covid[bottom50_col]).mean()
-
-        change = ((ratio_2024 - ratio_2019) / ratio_2019) * 100
-
-        results[name] = {
-            "ratio_2019": ratio_2019,
-            "ratio_2024": ratio_2024,
-            "change_pct": change,
+    countries = COUNTRY_NAMES if countries is None else countries
+    codes = list(countries)
+
+    # Top 10% / bottom 50% ratio for every country at once: (date, country)
+    top10 = df[[WEALTH_METRICS[code]["net_wealth_top10"] for code in codes]].to_numpy()
+    bottom50 = df[[WEALTH_METRICS[code]["net_wealth_bottom50"] for code in codes]].to_numpy()
+    ratios = top10 / bottom50
+    years = df["DATE"].dt.year.to_numpy()
+
+    # Pre-COVID average (2019) and post-COVID recent (2024)
+    ratios_2019 = np.nanmean(ratios[years == 2019], axis=0)
+    ratios_2024 = np.nanmean(ratios[years == 2024], axis=0)
+    changes = (ratios_2024 - ratios_2019) / ratios_2019 * 100
+
+    names = [countries[code] for code in codes]
+    results = {
+        name: {
+            "ratio_2019": float(r2019),
+            "ratio_2024": float(r2024),
+            "change_pct": float(chg),
         }
-        data_for_plot.append((name, ratio_2019, ratio_2024, change))
+        for name, r2019, r2024, chg in zip(names, ratios_2019, ratios_2024, changes)
+    }
+    data_for_plot = list(zip(names, ratios_2019, ratios_2024, changes))
 
-    # Create visualization
-    fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+    # Create visualization (grows with the number of countries)
+    height = max(5, 0.35 * len(codes))
+    fig, axes = plt.subplots(1, 3, figsize=(max(18, 0.6 * len(codes) + 12), height))
     fig.suptitle(
         "WEALTH CONCENTRATION: Top 10% to Bottom 50% Ratio",
         fontsize=16,
@@ -284,14 +425,9 @@ def calculate_wealth_concentration_ratios(df):
         y=1.02,
     )
 
-    countries = [d[0] for d in data_for_plot]
-    ratios_2019 = [d[1] for d in data_for_plot]
-    ratios_2024 = [d[2] for d in data_for_plot]
-    changes = [d[3] for d in data_for_plot]
-
     # Panel 1: 2019 vs 2024 Ratios
     ax1 = axes[0]
-    x = np.arange(len(countries))
+    x = np.arange(len(names))
     width = 0.35
     bars1 = ax1.bar(
         x - width / 2, ratios_2019, width, label="2019", color="#1f77b4", alpha=0.8
@@ -302,44 +438,27 @@ def calculate_wealth_concentration_ratios(df):
     ax1.set_ylabel("Concentration Ratio (times)", fontweight="bold")
     ax1.set_title("Concentration Ratios: 2019 vs 2024", fontweight="bold")
     ax1.set_xticks(x)
-    ax1.set_xticklabels(countries)
+    ax1.set_xticklabels(names)
     ax1.legend()
     ax1.grid(True, alpha=0.3, axis="y")
 
-    # Add value labels on bars
+    # Add value labels on bars (one call per bar container)
     for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            ax1.text(
-                bar.get_x() + bar.get_width() / 2.0,
-                height,
-                f"{height:.1f}x",
-                ha="center",
-                va="bottom",
-                fontsize=9,
-            )
+        ax1.bar_label(bars, fmt="%.1fx", fontsize=9)
 
     # Panel 2: Change Percentage
     ax2 = axes[1]
     colors_change = ["#2ca02c" if c < 0 else "#d62728" for c in changes]
-    bars = ax2.barh(countries, changes, color=colors_change, alpha=0.7)
+    bars = ax2.barh(names, changes, color=colors_change, alpha=0.7)
     ax2.set_xlabel("Change (%)", fontweight="bold")
     ax2.set_title("Percentage Change (2019→2024)", fontweight="bold")
     ax2.axvline(x=0, color="black", linestyle="-", linewidth=0.8)
     ax2.grid(True, alpha=0.3, axis="x")
 
     # Add value labels
-    for i, (bar, val) in enumerate(zip(bars, changes)):
-        width = bar.get_width()
-        label_x_pos = width + (0.3 if width > 0 else -0.3)
-        ax2.text(
-            label_x_pos,
-            bar.get_y() + bar.get_height() / 2.0,
-            f"{val:+.1f}%",
-            ha="left" if width > 0 else "right",
-            va="center",
-            fontweight="bold",
-        )
+    ax2.bar_label(
+        bars, labels=[f"{val:+.1f}%" for val in changes], padding=3, fontweight="bold"
+    )
 
     # Panel 3: Summary Table
     ax3 = axes[2]
@@ -4,6 +4,16 @@
 DF_PATH = "datasets/Distributional Wealth Accounts.csv"
 COVID_PATH = "datasets/EU Covid-19.csv"
 
+# Parsed-dataset cache (sits next to the CSV files)
+CACHE_DIR_NAME = ".cache"
+
+# Remote sources used by `python -m helpers.refresh`, keyed by dataset
+# The DWA export has no stable public URL: point "wealth" at your mirror to enable it
+SOURCE_URLS = {
+    "wealth": None,
+    "covid": "https://opendata.ecdc.europa.eu/covid19/nationalcasedeath_eueea_daily_ei/csv/data.csv",
+}
+
 # Country mapping
 COUNTRY_NAMES = {"DE": "Germany", "FR": "France", "SI": "Slovenia"}
 
@@ -1,10 +1,62 @@
 """Data loading and preprocessing utilities."""
 
+import os
+import numpy as np
 import pandas as pd
-from .config import DF_PATH, COVID_PATH, WEALTH_METRICS
+from .config import DF_PATH, COVID_PATH, WEALTH_METRICS, CACHE_DIR_NAME
+from .sparse_store import SpanFrame
 
 
-def load_wealth_data(path=DF_PATH):
+def cache_path(path):
+    """Return the location of the parsed binary cache for a CSV file."""
+    directory, filename = os.path.split(path)
+    return os.path.join(directory, CACHE_DIR_NAME, filename + ".pkl")
+
+
+def cache_is_fresh(path):
+    """Return True if the binary cache for `path` exists and is not stale."""
+    cached = cache_path(path)
+    return os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(path)
+
+
+def read_cache(path):
+    """Return the cached DataFrame for `path`, or None if missing or stale."""
+    if not cache_is_fresh(path):
+        return None
+    return pd.read_pickle(cache_path(path))
+
+
+def _write_cache(path, df):
+    """Atomically store a parsed DataFrame in the binary cache."""
+    cached = cache_path(path)
+    os.makedirs(os.path.dirname(cached), exist_ok=True)
+    tmp = cached + ".tmp"
+    df.to_pickle(tmp)
+    os.replace(tmp, cached)
+
+
+def rebuild_cache(path, loader):
+    """
+    Re-parse a CSV file and overwrite its binary cache.
+
+    Parameters:
+    -----------
+    path : str
+        Path to the CSV file
+    loader : callable
+        Loader for that file (load_wealth_data or load_covid_data)
+
+    Returns:
+    --------
+    DataFrame
+        Freshly parsed data
+    """
+    df = loader(path)
+    _write_cache(path, df)
+    return df
+
+
+def load_wealth_data(path=DF_PATH, use_cache=False):
     """
     Load wealth distribution dataset and parse dates.
 
@@ -12,24 +64,56 @@ def load_wealth_data(path=DF_PATH):
     -----------
     path : str
         Path to wealth distribution CSV file
+    use_cache : bool, default=False
+        Read from (and fill) the binary cache instead of re-parsing the CSV
 
     Returns:
     --------
     DataFrame
         Wealth data with parsed DATE column
     """
+    if use_cache:
+        df = read_cache(path)
+        if df is None:
+            df = rebuild_cache(path, load_wealth_data)
+        return df
+
     df = pd.read_csv(path)
+    return parse_wealth_dates(df)
+
+
+def parse_wealth_dates(df):
+    """Parse the DATE column of raw wealth data in place and return the frame."""
     df["DATE"] = pd.to_datetime(df["DATE"])
     return df
 
 
+def load_wealth_spans(path=DF_PATH, use_cache=False):
+    """
+    Load the wealth dataset as a SpanFrame (populated spans only).
+
+    Parameters:
+    -----------
+    path : str
+        Path to wealth distribution CSV file
+    use_cache : bool, default=False
+        Parse through the binary cache (see load_wealth_data)
+
+    Returns:
+    --------
+    SpanFrame
+        Every series with its valid date range, stored contiguously
+    """
+    return SpanFrame.from_frame(load_wealth_data(path, use_cache=use_cache))
+
+
 def filter_wealth_data(df, start_date="2016-01-01", end_date="2025-12-31"):
     """
     Filter wealth data by date range and add time features.
 
     Parameters:
     -----------
-    df : DataFrame
+    df : DataFrame or SpanFrame
         Raw wealth data
     start_date : str
         Start date for filtering (YYYY-MM-DD)
@@ -38,9 +122,13 @@ def filter_wealth_data(df, start_date="2016-01-01", end_date="2025-12-31"):
 
     Returns:
     --------
-    DataFrame
+    DataFrame or SpanFrame
         Filtered data with 'days_since_start' feature for modeling
+        (a SpanFrame input is restricted in place of copying)
     """
+    if isinstance(df, SpanFrame):
+        return df.between(start_date, end_date, reset_origin=True)
+
     df_filtered = df[(df["DATE"] >= start_date) & (df["DATE"] <= end_date)].copy()
     df_filtered["days_since_start"] = (
         df_filtered["DATE"] - df_filtered["DATE"].min()
@@ -48,13 +136,126 @@ def filter_wealth_data(df, start_date="2016-01-01", end_date="2025-12-31"):
     return df_filtered
 
 
+def stack_wealth_metrics(df, country_codes=None, metrics=None):
+    """
+    Stack the WEALTH_METRICS series of several countries into one array.
+
+    Parameters:
+    -----------
+    df : DataFrame
+        Wealth data with a DATE column
+    country_codes : list, optional
+        Country codes (defaults to all configured countries)
+    metrics : list, optional
+        Metric keys (defaults to every key configured for the first country)
+
+    Returns:
+    --------
+    tuple
+        (dates, country_codes, metrics, values) with values shaped
+        (n_countries, n_dates, n_metrics); metrics a country lacks are NaN
+    """
+    country_codes = list(WEALTH_METRICS) if country_codes is None else list(country_codes)
+    if metrics is None:
+        metrics = list(WEALTH_METRICS[country_codes[0]])
+
+    df = df.sort_values("DATE")
+    values = np.full((len(country_codes), len(df), len(metrics)), np.nan)
+    for c, code in enumerate(country_codes):
+        config = WEALTH_METRICS[code]
+        present = [m for m, key in enumerate(metrics) if config.get(key) in df]
+        columns = [config[metrics[m]] for m in present]
+        values[c][:, present] = df[columns].to_numpy(dtype="float64")
+
+    dates = df["DATE"].to_numpy(dtype="datetime64[ns]")
+    return dates, country_codes, list(metrics), values
+
+
+def years_since(dates, origin):
+    """Elapsed time in years (of 365.25 days) from origin to each date; broadcasts."""
+    return (dates - origin).astype("timedelta64[D]").astype("float64") / 365.25
+
+
+def unstack_predictions(forecasts, country_codes, metrics, fitted=None):
+    """
+    Split stacked forecasts into the train_predict_country() format.
+
+    Parameters:
+    -----------
+    forecasts : ndarray
+        Predictions shaped (n_countries, n_metrics, n_dates)
+    country_codes : list
+        Country codes of the first axis
+    metrics : list
+        Metric keys of the second axis
+    fitted : ndarray, optional
+        Boolean (n_countries, n_metrics) mask of series that have a model
+        (defaults to series whose forecasts are not all NaN)
+
+    Returns:
+    --------
+    dict
+        Country code -> {metric key: predicted values}, keeping only metrics
+        configured for that country in WEALTH_METRICS
+    """
+    if fitted is None:
+        fitted = ~np.isnan(forecasts).all(axis=-1)
+    results = {}
+    for c, code in enumerate(country_codes):
+        config = WEALTH_METRICS[code]
+        results[code] = {
+            key: forecasts[c, m]
+            for m, key in enumerate(metrics)
+            if key in config and fitted[c, m]
+        }
+    return results
+
+
+def stack_covid_regressors(df_covid_quarterly, dates, country_names, covid_cols, fill_after=np.nan):
+    """
+    Align quarterly COVID-19 columns of several countries on a date axis.
+
+    Quarters before a country's first COVID-19 record count as zero.
+
+    Parameters:
+    -----------
+    df_covid_quarterly : DataFrame
+        Output of aggregate_covid_quarterly() (or resample_covid())
+    dates : array-like of datetime64
+        Target date axis (e.g. from stack_wealth_metrics)
+    country_names : list
+        Country names as they appear in the COVID dataset
+    covid_cols : list
+        COVID-19 columns to align
+    fill_after : float, default=NaN
+        Value for dates after a country's last COVID-19 record
+
+    Returns:
+    --------
+    ndarray
+        Array shaped (n_countries, n_dates, n_cols); NaN for unknown countries
+    """
+    index = pd.DatetimeIndex(dates)
+    covid_cols = list(covid_cols)
+    values = np.full((len(country_names), len(index), len(covid_cols)), np.nan)
+    for c, name in enumerate(country_names):
+        covid = df_covid_quarterly[df_covid_quarterly["countriesAndTerritories"] == name]
+        if covid.empty:
+            continue
+        aligned = covid.set_index("DATE")[covid_cols].reindex(index)
+        aligned[index < covid["DATE"].min()] = 0.0
+        aligned[index > covid["DATE"].max()] = fill_after
+        values[c] = aligned.to_numpy(dtype="float64")
+    return values
+
+
 def split_train_test(df, split_date="2020-01-01"):
     """
     Split data into training (pre-COVID) and test (COVID period) sets.
 
     Parameters:
     -----------
-    df : DataFrame
+    df : DataFrame or SpanFrame
         Full dataset with DATE column
     split_date : str
         Date to split train/test (default: start of 2020)
@@ -62,14 +263,17 @@ def split_train_test(df, split_date="2020-01-01"):
     Returns:
     --------
     tuple
-        (train_df, test_df) DataFrames
+        (train_df, test_df) DataFrames, or SpanFrames for a SpanFrame input
     """
+    if isinstance(df, SpanFrame):
+        return df.between(end_date=split_date, closed="left"), df.between(split_date)
+
     train = df[df["DATE"] < split_date].copy()
     test = df[df["DATE"] >= split_date].copy()
     return train, test
 
 
-def load_covid_data(path=COVID_PATH):
+def load_covid_data(path=COVID_PATH, use_cache=False):
     """
     Load COVID-19 dataset and parse dates.
 
@@ -77,18 +281,130 @@ def load_covid_data(path=COVID_PATH):
     -----------
     path : str
         Path to COVID-19 CSV file
+    use_cache : bool, default=False
+        Read from (and fill) the binary cache instead of re-parsing the CSV
 
     Returns:
     --------
     DataFrame
         COVID-19 data with parsed date column
     """
+    if use_cache:
+        df_c = read_cache(path)
+        if df_c is None:
+            df_c = rebuild_cache(path, load_covid_data)
+        return df_c
+
     df_c = pd.read_csv(path)
+    return parse_covid_dates(df_c)
+
+
+def parse_covid_dates(df_c):
+    """Add the parsed 'date' column to raw COVID-19 data and return the frame."""
     # Parse date from European format (DD/MM/YYYY)
     df_c["date"] = pd.to_datetime(df_c["dateRep"], format="%d/%m/%Y")
     return df_c
 
 
+# Supported resampling frequencies (period end dates, as in the wealth data)
+RESAMPLE_FREQUENCIES = ("W", "M", "Q", "A")
+
+# Default aggregation of the daily ECDC columns
+COVID_AGGREGATIONS = {"cases": "sum", "deaths": "sum", "popData2020": "first"}
+
+
+def period_end_dates(dates, freq="Q"):
+    """
+    Map dates to the end date of their period using integer calendar arithmetic.
+
+    Parameters:
+    -----------
+    dates : array-like of datetime64
+        Dates to map
+    freq : str, default='Q'
+        'W' (weeks ending Sunday), 'M', 'Q' or 'A'
+
+    Returns:
+    --------
+    ndarray
+        datetime64[D] period end date for every input date
+    """
+    days = np.asarray(dates, dtype="datetime64[D]")
+
+    if freq == "W":
+        # 1970-01-01 was a Thursday: shift so weeks run Monday..Sunday
+        week = (days.astype("int64") + 3) // 7
+        return (week * 7 + 3).astype("datetime64[D]")
+
+    months = days.astype("datetime64[M]").astype("int64")
+    if freq == "M":
+        last_month = months
+    elif freq == "Q":
+        last_month = months // 3 * 3 + 2
+    elif freq == "A":
+        last_month = months // 12 * 12 + 11
+    else:
+        raise ValueError(f"Unknown freq: {freq}")
+
+    # First day of the following month, minus one day
+    return (last_month + 1).astype("datetime64[M]").astype("datetime64[D]") - 1
+
+
+def resample_covid(df_c, countries=None, freq="Q", agg=None):
+    """
+    Aggregate daily COVID-19 data to weekly, monthly, quarterly or annual periods.
+
+    Periods are keyed by their end date (the convention of the wealth data's
+    DATE column), computed without building date strings.
+
+    Parameters:
+    -----------
+    df_c : DataFrame
+        Raw COVID-19 data with daily records (load_covid_data output)
+    countries : list, optional
+        Country names to include (defaults to all territories)
+    freq : str, default='Q'
+        Target frequency: 'W', 'M', 'Q' or 'A'
+    agg : dict, optional
+        Column to aggregation ('sum', 'mean', 'max', 'min', 'first', 'last');
+        defaults to COVID_AGGREGATIONS
+
+    Returns:
+    --------
+    DataFrame
+        One row per country and period with a DATE column, the aggregated
+        columns and, when cases/deaths are summed, per-100k rates
+    """
+    agg = dict(COVID_AGGREGATIONS if agg is None else agg)
+
+    filtered = df_c
+    if countries is not None:
+        filtered = df_c[df_c["countriesAndTerritories"].isin(countries)]
+    if any(how in ("first", "last") for how in agg.values()):
+        filtered = filtered.sort_values("date", kind="stable")
+
+    keys = pd.Series(
+        period_end_dates(filtered["date"].to_numpy(), freq).astype("datetime64[ns]"),
+        index=filtered.index,
+        name="DATE",
+    )
+    resampled = (
+        filtered.groupby([filtered["countriesAndTerritories"], keys], sort=True)
+        .agg(agg)
+        .reset_index()
+    )
+
+    # Normalize by population to enable cross-country comparisons
+    if "popData2020" in resampled:
+        for col in ("cases", "deaths"):
+            if agg.get(col) == "sum":
+                resampled[f"{col}_per_100k"] = (
+                    resampled[col] / resampled["popData2020"]
+                ) * 100000
+
+    return resampled
+
+
 def aggregate_covid_quarterly(df_c, countries):
     """
     Aggregate daily COVID-19 data to quarterly totals for specific countries.
@@ -107,41 +423,10 @@ def aggregate_covid_quarterly(df_c, countries):
     DataFrame
         Quarterly aggregated data with cases/deaths per 100k population
     """
-    # Filter for countries of interest
-    filtered = df_c[df_c["countriesAndTerritories"].isin(countries)].copy()
-    filtered = filtered.sort_values("date")
-
-    # Extract year and quarter from date
-    filtered["year"] = filtered["date"].dt.year
-    filtered["quarter"] = filtered["date"].dt.quarter
-
-    # Aggregate to quarterly level: sum cases and deaths, keep population
-    quarterly = (
-        filtered.groupby(["countriesAndTerritories", "year", "quarter"])
-        .agg(
-            {
-                "cases": "sum",  # Total cases in the quarter
-                "deaths": "sum",  # Total deaths in the quarter
-                "popData2020": "first",  # Population (constant)
-            }
-        )
-        .reset_index()
-    )
+    quarterly = resample_covid(df_c, countries, freq="Q")
 
-    # Normalize by population to enable cross-country comparisons
-    quarterly["cases_per_100k"] = (
-        quarterly["cases"] / quarterly["popData2020"]
-    ) * 100000
-    quarterly["deaths_per_100k"] = (
-        quarterly["deaths"] / quarterly["popData2020"]
-    ) * 100000
-
-    # Create DATE column matching wealth data format (end of quarter)
-    quarterly["DATE"] = pd.to_datetime(
-        quarterly["year"].astype(str)
-        + "-"
-        + (quarterly["quarter"] * 3).astype(str)
-        + "-01"
-    ) + pd.offsets.MonthEnd(0)
-
-    return quarterly
+    # Keep the year/quarter keys of the original quarterly layout
+    quarterly.insert(1, "year", quarterly["DATE"].dt.year)
+    quarterly.insert(2, "quarter", quarterly["DATE"].dt.quarter)
+    columns = [c for c in quarterly.columns if c != "DATE"] + ["DATE"]
+    return quarterly[columns]
@@ -0,0 +1,216 @@
+"""Decomposition of net wealth changes into asset, liability and housing components."""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# DWA series key embedded in every column name, e.g.
+# "... (DWA.Q.DE.S14.A.LE.F2M.D10.EUR.S.N)"
+_SERIES_KEY = re.compile(
+    r"\(DWA\.Q\.(?P<country>\w+)\.S14\.(?P<side>[ALN])\.LE\.(?P<instrument>\w+)"
+    r"\.(?P<group>\w+)\.(?P<unit>\w+)\.S\.N\)"
+)
+
+INSTRUMENTS = {
+    "F2M": "deposits",
+    "F3": "debt_securities",
+    "F511": "listed_shares",
+    "F51M": "financial_business_wealth",
+    "F62": "life_insurance",
+    "NUN": "housing",
+    "NUB": "non_financial_business_wealth",
+    "F4B": "house_purchase_loans",
+}
+# Group and unit labels, matching inequality.GROWTH_GROUPS
+GROUPS = {
+    "B50": "bottom50",
+    "D6": "d6",
+    "D7": "d7",
+    "D8": "d8",
+    "D9": "d9",
+    "D10": "top10",
+    "_Z": "all",
+}
+UNITS = {"EUR": "total", "EUR_R_POP": "per_capita", "EUR_R_NH": "per_household"}
+
+RESULT_COLUMNS = [
+    "country",
+    "group",
+    "unit",
+    "component",
+    "start",
+    "end",
+    "contribution",
+    "share_pct",
+    "growth_pp",
+]
+
+TOTAL = "F_NNA"  # total assets (side A) or total liabilities (side L)
+NET = "NWA"
+
+
+def dwa_series(columns):
+    """
+    Parse the DWA series keys of wealth data columns.
+
+    Parameters:
+    -----------
+    columns : iterable of str
+        Column names of the wealth dataset
+
+    Returns:
+    --------
+    DataFrame
+        One row per stock series with column, country, side ('A' assets,
+        'L' liabilities, 'N' net), instrument, group and unit codes
+    """
+    rows = []
+    for col in columns:
+        match = _SERIES_KEY.search(col)
+        if match:
+            rows.append({"column": col, **match.groupdict()})
+    return pd.DataFrame(rows, columns=["column", "country", "side", "instrument", "group", "unit"])
+
+
+def _component_levels(series, values):
+    """
+    Component levels that add up to net wealth for one (country, group, unit).
+
+    Liabilities are recorded with a negative sign in the DWA, so net wealth is
+    the plain sum of asset and liability levels. Reported totals close the
+    identity: with total assets, liabilities are implied as net - assets (and
+    the reverse with total liabilities); without either, whatever the
+    instruments leave unexplained is 'other'.
+
+    Returns:
+    --------
+    tuple
+        (net, levels) with levels a {component: level array} dict, or None
+        when the extract has nothing to decompose this net series into
+    """
+    net = values[series.index[series["side"].eq("N")][0]]
+    instruments = series[series["instrument"].isin(list(INSTRUMENTS))]
+    totals = series[series["instrument"].eq(TOTAL)].set_index("side")
+    if instruments.empty and totals.empty:
+        return net, None
+
+    levels = {}
+    side_sums = {"A": np.zeros_like(net), "L": np.zeros_like(net)}
+    for idx, row in instruments.iterrows():
+        levels[INSTRUMENTS[row["instrument"]]] = values[idx]
+        side_sums[row["side"]] = side_sums[row["side"]] + values[idx]
+
+    if "A" in totals.index:
+        assets = values[totals.loc["A", "row"]]
+        liabilities = net - assets
+    elif "L" in totals.index:
+        liabilities = values[totals.loc["L", "row"]]
+        assets = net - liabilities
+    else:
+        levels["other"] = net - side_sums["A"] - side_sums["L"]
+        return net, levels
+
+    # 'other_*' when part of the side is itemized by instruments
+    itemized = set(instruments["side"])
+    levels["other_assets" if "A" in itemized else "assets"] = assets - side_sums["A"]
+    levels["other_liabilities" if "L" in itemized else "liabilities"] = liabilities - side_sums["L"]
+    return net, levels
+
+
+def _date_pairs(dates, pairs):
+    """Start and end positions on the date axis for the requested pairs."""
+    if pairs == "all":
+        return np.triu_indices(len(dates), k=1)
+    starts, ends = zip(*pairs)
+    index = pd.DatetimeIndex(dates)
+    start = index.get_indexer(pd.DatetimeIndex(starts))
+    end = index.get_indexer(pd.DatetimeIndex(ends))
+    if (start < 0).any() or (end < 0).any():
+        raise ValueError("Every pair date must be a quarter end present in the data")
+    return start, end
+
+
+def decompose_net_wealth(df, pairs=(("2019-12-31", "2021-12-31"),), country_codes=None):
+    """
+    Contribution of each component to net wealth changes between dates.
+
+    Every (country, group, unit) with a net wealth series is decomposed using
+    whichever instrument columns the extract provides for that same group and
+    unit (deposits, debt securities, listed shares, housing, house-purchase
+    loans, ...), closed by the reported asset or liability total or by an
+    'other' residual, so contributions always sum to the net change. All
+    components and date pairs are evaluated in one broadcast difference.
+
+    Parameters:
+    -----------
+    df : DataFrame
+        Wealth data with a DATE column (load_wealth_data output)
+    pairs : sequence of (start, end) or 'all', default=(('2019-12-31', '2021-12-31'),)
+        Date pairs to compare; 'all' uses every pair of quarters
+    country_codes : list, optional
+        Country codes to include (defaults to every country in the data)
+
+    Returns:
+    --------
+    DataFrame
+        One row per country, group, unit, component and pair with start/end
+        dates, the absolute contribution, its share of the net change (%) and
+        its contribution to net growth (percentage points)
+    """
+    df = df.sort_values("DATE")
+    series = dwa_series(df.columns)
+    series = series[
+        (series["side"].ne("N") | series["instrument"].eq(NET)) & series["unit"].isin(list(UNITS))
+    ]
+    if country_codes is not None:
+        series = series[series["country"].isin(country_codes)]
+    series = series.reset_index(drop=True)
+    series["row"] = series.index
+    values = df[series["column"]].to_numpy(dtype="float64").T
+
+    labels, net_rows, component_rows = [], [], []
+    for (country, group, unit), block in series.groupby(["country", "group", "unit"]):
+        if not block["side"].eq("N").any():
+            continue
+        block = block.set_index("row", drop=False)
+        net, levels = _component_levels(block, values)
+        if levels is None:
+            continue
+        for name, level in levels.items():
+            labels.append((country, GROUPS.get(group, group.lower()), UNITS[unit], name))
+            net_rows.append(net)
+            component_rows.append(level)
+
+    if not labels:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    levels = np.vstack(component_rows)
+    nets = np.vstack(net_rows)
+    dates = df["DATE"].to_numpy(dtype="datetime64[ns]")
+    start, end = _date_pairs(dates, pairs)
+
+    # (component, pair) differences in one broadcast
+    contribution = levels[:, end] - levels[:, start]
+    net_change = nets[:, end] - nets[:, start]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = contribution / net_change * 100
+        growth = contribution / np.abs(nets[:, start]) * 100
+
+    n_components, n_pairs = contribution.shape
+    labels = np.array(labels, dtype=object)
+    rows = np.repeat(np.arange(n_components), n_pairs)
+    result = pd.DataFrame(
+        {
+            "country": labels[rows, 0],
+            "group": labels[rows, 1],
+            "unit": labels[rows, 2],
+            "component": labels[rows, 3],
+            "start": np.tile(dates[start], n_components),
+            "end": np.tile(dates[end], n_components),
+            "contribution": contribution.ravel(),
+            "share_pct": share.ravel(),
+            "growth_pp": growth.ravel(),
+        }
+    )
+    return result.dropna(subset=["contribution"]).reset_index(drop=True)
@@ -0,0 +1,209 @@
+"""Rolling-window epidemiological indicators from the daily ECDC data."""
+
+import numpy as np
+import pandas as pd
+from scipy.ndimage import maximum_filter1d
+from .data_loader import period_end_dates
+
+
+def _daily_grid(df_c, countries=None):
+    """
+    Pivot the daily records onto a dense (country x day) grid.
+
+    Days without a report stay NaN so windows can tell them apart from zeros.
+
+    Returns:
+    --------
+    tuple
+        (names, days, cases, deaths, population, first, last) where
+        cases/deaths are (n_countries, n_days) arrays and first/last are the
+        grid positions of each country's first and last report
+    """
+    if countries is not None:
+        df_c = df_c[df_c["countriesAndTerritories"].isin(countries)]
+
+    codes, names = pd.factorize(df_c["countriesAndTerritories"], sort=True)
+    dates = df_c["date"].to_numpy(dtype="datetime64[D]")
+    start = dates.min()
+    pos = (dates - start).astype("int64")
+    days = np.arange(start, dates.max() + 1, dtype="datetime64[D]")
+
+    shape = (len(names), len(days))
+    cases = np.full(shape, np.nan)
+    deaths = np.full(shape, np.nan)
+    cases[codes, pos] = df_c["cases"].to_numpy(dtype="float64")
+    deaths[codes, pos] = df_c["deaths"].to_numpy(dtype="float64")
+
+    population = np.zeros(len(names))
+    population[codes] = df_c["popData2020"].to_numpy(dtype="float64")
+
+    first = np.full(len(names), len(days))
+    last = np.full(len(names), -1)
+    np.minimum.at(first, codes, pos)
+    np.maximum.at(last, codes, pos)
+    return np.asarray(names), days, cases, deaths, population, first, last
+
+
+def _window_sum(values, window, min_periods):
+    """
+    Trailing window sums along the day axis via cumulative sums, O(n).
+
+    Missing days contribute nothing; windows with fewer than `min_periods`
+    reported days are NaN.
+    """
+    observed = ~np.isnan(values)
+    n_days = values.shape[1]
+
+    totals = np.zeros((values.shape[0], n_days + 1))
+    counts = np.zeros((values.shape[0], n_days + 1))
+    np.cumsum(np.where(observed, values, 0.0), axis=1, out=totals[:, 1:])
+    np.cumsum(observed, axis=1, out=counts[:, 1:])
+
+    idx = np.arange(n_days)
+    lo = np.maximum(idx + 1 - window, 0)
+    sums = totals[:, idx + 1] - totals[:, lo]
+    reported = counts[:, idx + 1] - counts[:, lo]
+    sums[reported < min_periods] = np.nan
+    return sums
+
+
+def compute_indicators(
+    df_c,
+    countries=None,
+    min_periods=None,
+    clip_negative=True,
+    peak_distance=28,
+    peak_min_height=0.1,
+):
+    """
+    Compute rolling incidence, death rates and wave peaks for every country.
+
+    All countries are processed together on a (country x day) grid, with
+    each window obtained as a difference of cumulative sums.
+
+    Parameters:
+    -----------
+    df_c : DataFrame
+        Raw COVID-19 data with daily records (load_covid_data output)
+    countries : list, optional
+        Country names to include (defaults to all territories)
+    min_periods : int, optional
+        Minimum reported days per window (default: just over half the window)
+    clip_negative : bool, default=True
+        Negative daily corrections are kept in the sums (they offset earlier
+        over-reporting); this only floors the resulting window totals at zero
+    peak_distance : int, default=28
+        Minimum number of days between two wave peaks of a country
+    peak_min_height : float, default=0.1
+        Peaks below this fraction of the country's highest 7-day incidence
+        are ignored
+
+    Returns:
+    --------
+    DataFrame
+        One row per country and day between its first and last report, with
+        7/14-day incidence and deaths per 100k, 14-day case fatality ratio
+        and an 'is_peak' flag
+    """
+    names, days, cases, deaths, population, first, last = _daily_grid(df_c, countries)
+    per_100k = (100000 / population)[:, None]
+
+    indicators = {}
+    for window in (7, 14):
+        periods = window // 2 + 1 if min_periods is None else min_periods
+        case_sum = _window_sum(cases, window, periods)
+        death_sum = _window_sum(deaths, window, periods)
+        if clip_negative:
+            case_sum = np.maximum(case_sum, 0)
+            death_sum = np.maximum(death_sum, 0)
+        indicators[f"incidence_{window}d_per_100k"] = case_sum * per_100k
+        indicators[f"deaths_{window}d_per_100k"] = death_sum * per_100k
+        if window == 14:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                indicators["cfr_14d"] = np.where(case_sum > 0, death_sum / case_sum, np.nan)
+
+    # Wave peaks: maxima of the 7-day incidence within +/- peak_distance days
+    incidence = indicators["incidence_7d_per_100k"]
+    filled = np.where(np.isnan(incidence), -np.inf, incidence)
+    window_max = maximum_filter1d(filled, size=2 * peak_distance + 1, axis=1, mode="nearest")
+    height = peak_min_height * np.nanmax(incidence, axis=1, initial=0)[:, None]
+    is_peak = (filled == window_max) & (incidence >= height) & (incidence > 0)
+    # Keep only the first day of a plateau
+    is_peak[:, 1:] &= ~is_peak[:, :-1]
+
+    # Flatten to long format, restricted to each country's reporting range
+    grid_pos = np.arange(len(days))
+    in_range = (grid_pos >= first[:, None]) & (grid_pos <= last[:, None])
+    rows, cols = np.nonzero(in_range)
+
+    result = pd.DataFrame(
+        {
+            "countriesAndTerritories": names[rows],
+            "date": days[cols].astype("datetime64[ns]"),
+            "cases": cases[rows, cols],
+            "deaths": deaths[rows, cols],
+        }
+    )
+    for name, values in indicators.items():
+        result[name] = values[rows, cols]
+    result["is_peak"] = is_peak[rows, cols]
+    return result
+
+
+def wave_peaks(indicators):
+    """
+    List detected wave peaks.
+
+    Parameters:
+    -----------
+    indicators : DataFrame
+        Output of compute_indicators()
+
+    Returns:
+    --------
+    DataFrame
+        Peak date and 7-day incidence per country, numbered by wave
+    """
+    peaks = indicators.loc[
+        indicators["is_peak"],
+        ["countriesAndTerritories", "date", "incidence_7d_per_100k"],
+    ].reset_index(drop=True)
+    peaks["wave"] = peaks.groupby("countriesAndTerritories").cumcount() + 1
+    return peaks
+
+
+def summarize_indicators(indicators, freq="Q"):
+    """
+    Aggregate daily indicators to the wealth data frequency for merging.
+
+    Parameters:
+    -----------
+    indicators : DataFrame
+        Output of compute_indicators()
+    freq : str, default='Q'
+        Target frequency: 'W', 'M', 'Q' or 'A'
+
+    Returns:
+    --------
+    DataFrame
+        One row per country and period (DATE = period end) with mean and peak
+        7/14-day incidence, peak 14-day deaths per 100k and number of wave peaks;
+        merge on ['countriesAndTerritories', 'DATE'] with aggregate_covid_quarterly
+    """
+    keys = pd.Series(
+        period_end_dates(indicators["date"].to_numpy(), freq).astype("datetime64[ns]"),
+        index=indicators.index,
+        name="DATE",
+    )
+    summary = (
+        indicators.groupby([indicators["countriesAndTerritories"], keys])
+        .agg(
+            incidence_7d_mean=("incidence_7d_per_100k", "mean"),
+            incidence_7d_max=("incidence_7d_per_100k", "max"),
+            incidence_14d_max=("incidence_14d_per_100k", "max"),
+            deaths_14d_max=("deaths_14d_per_100k", "max"),
+            wave_peaks=("is_peak", "sum"),
+        )
+        .reset_index()
+    )
+    return summary
@@ -0,0 +1,317 @@
+"""Local experiment store for model comparison runs (stdlib sqlite3)."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import uuid
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from .config import DF_PATH, COVID_PATH
+
+DEFAULT_STORE = "experiments.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id       TEXT PRIMARY KEY,
+    created_at   TEXT NOT NULL,
+    train_start  TEXT,
+    train_end    TEXT,
+    split_date   TEXT,
+    wealth_hash  TEXT,
+    covid_hash   TEXT,
+    params       TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id   TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    country  TEXT NOT NULL,
+    metric   TEXT NOT NULL,
+    model    TEXT NOT NULL,
+    mae      REAL,
+    rmse     REAL,
+    r2       REAL,
+    is_best  INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_id, country, metric, model)
+);
+CREATE INDEX IF NOT EXISTS metrics_lookup ON metrics (country, metric, model, run_id);
+CREATE INDEX IF NOT EXISTS metrics_best ON metrics (is_best, country, metric);
+CREATE INDEX IF NOT EXISTS runs_created ON runs (created_at);
+"""
+
+_HASH_CHUNK = 1 << 20
+
+
+def data_hash(path):
+    """
+    SHA-256 of a data file, identifying the data version a run used.
+
+    Parameters:
+    -----------
+    path : str
+        File to hash
+
+    Returns:
+    --------
+    str or None
+        Hex digest, or None when the file does not exist
+    """
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _as_text(value):
+    if value is None:
+        return None
+    return str(pd.Timestamp(value).date())
+
+
+class ExperimentStore:
+    """
+    Run-tracking database of model comparisons.
+
+    Each run records its date windows, split date, model parameters and the
+    hashes of the input files, together with the per-metric scores of
+    compare_model_performance() and the winners of
+    find_best_model_per_metric(). Scores are indexed on
+    (country, metric, model, run) so leaderboards and trends over past runs
+    are single indexed queries.
+
+    Example:
+    --------
+    >>> with ExperimentStore() as store:
+    ...     run_id = store.log_run(comparisons, best_models, params={...})
+    ...     store.leaderboard(country="DE")
+    """
+
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def log_run(
+        self,
+        comparisons,
+        best_models=None,
+        params=None,
+        train_start=None,
+        train_end=None,
+        split_date=None,
+        data_paths=(DF_PATH, COVID_PATH),
+        run_id=None,
+    ):
+        """
+        Record one run in a single transaction.
+
+        Parameters:
+        -----------
+        comparisons : dict
+            Country code -> compare_model_performance() output
+        best_models : dict, optional
+            Country code -> find_best_model_per_metric() output; marks the
+            winning (metric, model) rows
+        params : dict, optional
+            Model types, hyperparameters and anything else to keep (JSON)
+        train_start, train_end, split_date : str or Timestamp, optional
+            Date window and train/test split of the run
+        data_paths : tuple, default=(DF_PATH, COVID_PATH)
+            Wealth and COVID-19 files whose hashes identify the data version
+        run_id : str, optional
+            Identifier (defaults to a random one)
+
+        Returns:
+        --------
+        str
+            The run identifier
+        """
+        run_id = run_id or uuid.uuid4().hex[:12]
+        wealth_path, covid_path = data_paths
+
+        rows = []
+        for code, df in comparisons.items():
+            best = set()
+            if best_models is not None and code in best_models:
+                best = set(zip(best_models[code]["Metric"], best_models[code]["Model"]))
+            rows.extend(
+                (
+                    run_id,
+                    code,
+                    metric,
+                    model,
+                    float(mae),
+                    float(rmse),
+                    float(r2),
+                    int((metric, model) in best),
+                )
+                for metric, model, mae, rmse, r2 in zip(
+                    df["Metric"], df["Model"], df["MAE"], df["RMSE"], df["R²"]
+                )
+            )
+
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    _as_text(train_start),
+                    _as_text(train_end),
+                    _as_text(split_date),
+                    data_hash(wealth_path),
+                    data_hash(covid_path),
+                    json.dumps(params or {}, default=str, sort_keys=True),
+                ),
+            )
+            self.conn.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return run_id
+
+    def delete_run(self, run_id):
+        """Remove a run and its scores."""
+        with self.conn:
+            self.conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+    def _query(self, sql, args=()):
+        return pd.read_sql_query(sql, self.conn, params=list(args))
+
+    def runs(self):
+        """
+        List recorded runs, newest first.
+
+        Returns:
+        --------
+        DataFrame
+            One row per run with dates, data hashes and decoded params
+        """
+        df = self._query("SELECT * FROM runs ORDER BY created_at DESC")
+        df["params"] = df["params"].map(json.loads)
+        return df
+
+    def leaderboard(self, country=None, metric=None, score="mae", run_ids=None, best_only=False):
+        """
+        Rank models by average score over past runs.
+
+        Parameters:
+        -----------
+        country : str, optional
+            Restrict to one country code
+        metric : str, optional
+            Restrict to one wealth metric
+        score : str, default='mae'
+            'mae', 'rmse' (lower is better) or 'r2' (higher is better)
+        run_ids : list, optional
+            Restrict to these runs (defaults to all)
+        best_only : bool, default=False
+            Count how often each model won instead of averaging scores
+
+        Returns:
+        --------
+        DataFrame
+            One row per (country, metric, model) with the mean score, number
+            of runs and wins, ranked within each (country, metric); models
+            without a score (e.g. R² of a one-point test series) rank last
+        """
+        if score not in ("mae", "rmse", "r2"):
+            raise ValueError(f"Unknown score: {score}")
+
+        where, args = [], []
+        if country is not None:
+            where.append("country = ?")
+            args.append(country)
+        if metric is not None:
+            where.append("metric = ?")
+            args.append(metric)
+        if run_ids is not None:
+            where.append(f"run_id IN ({', '.join('?' * len(run_ids))})")
+            args.extend(run_ids)
+        if best_only:
+            where.append("is_best = 1")
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+        df = self._query(
+            f"""
+            SELECT country, metric, model,
+                   AVG({score}) AS {score}, COUNT(*) AS runs, SUM(is_best) AS wins
+            FROM metrics {clause}
+            GROUP BY country, metric, model
+            """,
+            args,
+        )
+        if best_only:
+            ranked, ascending = "wins", False
+        else:
+            ranked, ascending = score, score != "r2"
+        df["rank"] = (
+            df.groupby(["country", "metric"])[ranked]
+            .rank(method="min", ascending=ascending, na_option="bottom")
+            .astype(int)
+        )
+        return df.sort_values(["country", "metric", "rank"], ignore_index=True)
+
+    def trend(self, country, metric, model=None, score="mae"):
+        """
+        Score of one series across runs, oldest first.
+
+        Parameters:
+        -----------
+        country : str
+            Country code
+        metric : str
+            Wealth metric key
+        model : str, optional
+            Restrict to one model (defaults to all)
+        score : str, default='mae'
+            'mae', 'rmse' or 'r2'
+
+        Returns:
+        --------
+        DataFrame
+            Columns run_id, created_at, split_date, model, score and is_best
+        """
+        if score not in ("mae", "rmse", "r2"):
+            raise ValueError(f"Unknown score: {score}")
+        sql = f"""
+            SELECT m.run_id, r.created_at, r.split_date, m.model, m.{score}, m.is_best
+            FROM metrics AS m JOIN runs AS r USING (run_id)
+            WHERE m.country = ? AND m.metric = ?
+        """
+        args = [country, metric]
+        if model is not None:
+            sql += " AND m.model = ?"
+            args.append(model)
+        return self._query(sql + " ORDER BY r.created_at, m.model", args)
+
+    def run_metrics(self, run_id):
+        """
+        Scores of one run in the compare_model_performance() layout.
+
+        Returns:
+        --------
+        DataFrame
+            Columns country, Metric, MAE, RMSE, R², Model and is_best
+        """
+        df = self._query(
+            "SELECT country, metric, mae, rmse, r2, model, is_best FROM metrics WHERE run_id = ?",
+            [run_id],
+        )
+        return df.rename(
+            columns={"metric": "Metric", "mae": "MAE", "rmse": "RMSE", "r2": "R²", "model": "Model"}
+        )
@@ -0,0 +1,268 @@
+"""Columnar export of predictions, metrics and merged panels.
+
+Tables are written as one `.npy` file per column plus a `_schema.json`
+sidecar, partitioned on disk as
+
+    <root>/run=<run_id>/<table>/country=<code>/model=<name>/
+
+so that BI jobs can memory-map exactly the partitions and columns they need.
+Text columns are stored as int32 codes with their categories in the schema.
+Only NumPy is required.
+"""
+
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+SCHEMA_FILE = "_schema.json"
+PARTITION_COLS = ("country", "model")
+
+
+def _partition_dir(root, run_id, table, keys):
+    parts = [f"run={run_id}", table] + [f"{col}={value}" for col, value in keys]
+    return os.path.join(root, *parts)
+
+
+def _write_partition(df, path):
+    """Write one partition atomically: columns to a temp dir, then rename."""
+    tmp = f"{path}.tmp-{uuid.uuid4().hex[:8]}"
+    os.makedirs(tmp)
+
+    schema = {"rows": len(df), "columns": []}
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        entry = {"name": str(col), "file": f"c{i}.npy"}
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            values = series.to_numpy(dtype="datetime64[ns]")
+            entry["kind"] = "datetime"
+        elif pd.api.types.is_numeric_dtype(series.dtype):
+            values = series.to_numpy()
+            entry["kind"] = "numeric"
+        else:
+            codes, uniques = pd.factorize(series)
+            values = codes.astype("int32")
+            entry["kind"] = "category"
+            entry["categories"] = [str(u) for u in uniques]
+        entry["dtype"] = values.dtype.str
+        np.save(os.path.join(tmp, entry["file"]), np.ascontiguousarray(values))
+        schema["columns"].append(entry)
+
+    with open(os.path.join(tmp, SCHEMA_FILE), "w") as fh:
+        json.dump(schema, fh, indent=1)
+
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp, path)
+
+
+def write_table(df, root, run_id, table, partition_cols=PARTITION_COLS):
+    """
+    Write a DataFrame as a partitioned columnar table.
+
+    Parameters:
+    -----------
+    df : DataFrame
+        Data to write
+    root : str
+        Export root directory
+    run_id : str
+        Run identifier (top-level partition)
+    table : str
+        Table name, e.g. 'metrics' or 'predictions'
+    partition_cols : sequence of str
+        Columns to partition on, when present in df (values are dropped from
+        the files and restored from the directory names on read)
+    """
+    keys = [col for col in partition_cols if col in df.columns]
+    if not keys:
+        path = _partition_dir(root, run_id, table, [])
+        _write_partition(df.reset_index(drop=True), path)
+        return
+
+    for values, part in df.groupby(keys, sort=False, dropna=False):
+        values = values if isinstance(values, tuple) else (values,)
+        path = _partition_dir(root, run_id, table, zip(keys, values))
+        _write_partition(part.drop(columns=keys).reset_index(drop=True), path)
+
+
+def _read_partition(path, columns=None, mmap=True):
+    with open(os.path.join(path, SCHEMA_FILE)) as fh:
+        schema = json.load(fh)
+
+    data = {}
+    for entry in schema["columns"]:
+        if columns is not None and entry["name"] not in columns:
+            continue
+        values = np.load(os.path.join(path, entry["file"]), mmap_mode="r" if mmap else None)
+        if entry["kind"] == "category":
+            values = pd.Categorical.from_codes(values, categories=entry["categories"])
+        data[entry["name"]] = values
+    return pd.DataFrame(data, copy=False), schema["rows"]
+
+
+def _matches(dirname, filters):
+    """Whether a 'key=value' partition directory passes the filters."""
+    key, _, value = dirname.partition("=")
+    return key not in filters or filters[key] == value
+
+
+def read_table(root, table, run_id=None, filters=None, columns=None, mmap=True):
+    """
+    Read a partitioned table back, memory-mapping the column files.
+
+    Parameters:
+    -----------
+    root : str
+        Export root directory
+    table : str
+        Table name
+    run_id : str, optional
+        Run to read (defaults to all runs)
+    filters : dict, optional
+        Partition values to keep, e.g. {'country': 'DE', 'model': 'Linear'};
+        non-matching partitions are never opened
+    columns : list, optional
+        Columns to load (partition columns are always included)
+    mmap : bool, default=True
+        Memory-map the column files instead of reading them into memory
+
+    Returns:
+    --------
+    DataFrame
+        Concatenated partitions with run_id and partition columns restored
+    """
+    filters = {k: str(v) for k, v in (filters or {}).items()}
+    if run_id is not None:
+        runs = [f"run={run_id}"]
+    else:
+        runs = sorted(d for d in os.listdir(root) if d.startswith("run="))
+
+    frames = []
+    for run in runs:
+        base = os.path.join(root, run, table)
+        if not os.path.isdir(base):
+            continue
+        for dirpath, dirnames, filenames in os.walk(base):
+            # Prune partitions that do not match the filters before opening them
+            dirnames[:] = [d for d in dirnames if ".tmp-" not in d and _matches(d, filters)]
+            if SCHEMA_FILE not in filenames:
+                continue
+            relative = os.path.relpath(dirpath, base).split(os.sep)
+            keys = dict(part.split("=", 1) for part in relative if "=" in part)
+            if any(keys.get(k) != v for k, v in filters.items()):
+                continue
+
+            frame, rows = _read_partition(dirpath, columns, mmap)
+            if frame.empty:
+                frame = frame.reindex(range(rows))
+            for key, value in keys.items():
+                frame[key] = value
+            frame["run_id"] = run.split("=", 1)[1]
+            frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def predictions_frame(predictions, test_df):
+    """
+    Flatten prediction dicts into a tidy table.
+
+    Parameters:
+    -----------
+    predictions : dict
+        Country code -> model name -> {metric: predicted values}
+        (e.g. {code: compare_models(...)} for every country)
+    test_df : DataFrame
+        Test data whose DATE column the predictions are aligned with
+
+    Returns:
+    --------
+    DataFrame
+        Columns country, model, metric, DATE, prediction
+    """
+    dates = test_df["DATE"].to_numpy(dtype="datetime64[ns]")
+    parts = []
+    for code, models in predictions.items():
+        for model, metrics in models.items():
+            for metric, values in metrics.items():
+                values = np.asarray(values, dtype="float64")
+                parts.append(
+                    pd.DataFrame(
+                        {
+                            "country": code,
+                            "model": model,
+                            "metric": metric,
+                            "DATE": dates[: len(values)],
+                            "prediction": values,
+                        }
+                    )
+                )
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+
+def _with_country(frames):
+    """Concatenate a {country: DataFrame} dict, adding a country column."""
+    return pd.concat(
+        [df.assign(country=code) for code, df in frames.items()], ignore_index=True
+    )
+
+
+def export_run(
+    root,
+    run_id=None,
+    comparisons=None,
+    best_models=None,
+    merged=None,
+    predictions=None,
+    test_df=None,
+):
+    """
+    Export the outputs of an analysis run in one call.
+
+    Parameters:
+    -----------
+    root : str
+        Export root directory
+    run_id : str, optional
+        Run identifier (defaults to a UTC timestamp)
+    comparisons : dict, optional
+        Country code -> compare_model_performance() output ('metrics' table)
+    best_models : dict, optional
+        Country code -> find_best_model_per_metric() output ('best_models' table)
+    merged : dict, optional
+        Country code -> merge_wealth_covid() output ('merged' table)
+    predictions : dict, optional
+        Country code -> model name -> prediction dict ('predictions' table)
+    test_df : DataFrame, optional
+        Test data the predictions refer to (required with predictions)
+
+    Returns:
+    --------
+    str
+        The run identifier
+    """
+    run_id = run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+
+    tables = {}
+    if comparisons:
+        tables["metrics"] = _with_country(comparisons).rename(columns={"Model": "model"})
+    if best_models:
+        tables["best_models"] = _with_country(best_models).rename(columns={"Model": "model"})
+    if merged:
+        tables["merged"] = _with_country(merged)
+    if predictions:
+        if test_df is None:
+            raise ValueError("test_df is required to export predictions")
+        tables["predictions"] = predictions_frame(predictions, test_df)
+
+    for table, df in tables.items():
+        write_table(df, root, run_id, table)
+    return run_id
@@ -0,0 +1,224 @@
+"""Inequality measures derived from the distributional wealth series."""
+
+import numpy as np
+import pandas as pd
+from .data_loader import stack_wealth_metrics, years_since
+
+# Population shares at which the Lorenz curve is known from the DWA groups:
+# bottom 50%, deciles 6-9 (decile 8 as a residual), top 10% and top 5%
+LORENZ_POPULATION = np.array([0.0, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 1.0])
+
+_LORENZ_METRICS = [
+    "net_wealth",
+    "net_wealth_bottom50",
+    "net_wealth_d6",
+    "net_wealth_d7",
+    "net_wealth_d9",
+    "net_wealth_top10",
+    "share_bottom50",
+    "share_top10",
+    "share_top5",
+    "gini",
+]
+
+
+def lorenz_points(df, country_codes=None):
+    """
+    Assemble Lorenz curve points for every country and quarter at once.
+
+    Published shares (bottom 50%, top 10%, top 5%) are used directly; decile
+    6, 7 and 9 shares come from their net wealth over total net wealth, and
+    decile 8 is whatever remains between decile 7 and the top 10%.
+
+    Parameters:
+    -----------
+    df : DataFrame
+        Wealth data with a DATE column
+    country_codes : list, optional
+        Country codes (defaults to all configured countries)
+
+    Returns:
+    --------
+    tuple
+        (dates, country_codes, population, lorenz) with lorenz shaped
+        (n_countries, n_dates, len(LORENZ_POPULATION)), as fractions of
+        total wealth; NaN where a group series is missing
+    """
+    dates, codes, metrics, values = stack_wealth_metrics(df, country_codes, _LORENZ_METRICS)
+    v = {key: values[..., i] for i, key in enumerate(metrics)}
+
+    total = v["net_wealth"]
+    bottom50 = v["share_bottom50"] / 100
+    d6 = v["net_wealth_d6"] / total
+    d7 = v["net_wealth_d7"] / total
+    d9 = v["net_wealth_d9"] / total
+    top10 = v["share_top10"] / 100
+    top5 = v["share_top5"] / 100
+
+    lorenz = np.stack(
+        [
+            np.zeros_like(total),
+            bottom50,
+            bottom50 + d6,
+            bottom50 + d6 + d7,
+            1 - top10 - d9,
+            1 - top10,
+            1 - top5,
+            np.ones_like(total),
+        ],
+        axis=-1,
+    )
+    # Propagate a missing total to the whole curve
+    lorenz[np.isnan(total)] = np.nan
+    return dates, codes, LORENZ_POPULATION.copy(), lorenz
+
+
+def implied_gini(population, lorenz):
+    """
+    Gini coefficient of a piecewise-linear Lorenz curve (trapezoid rule).
+
+    Being linear within groups, this is a lower bound of the true Gini.
+
+    Parameters:
+    -----------
+    population : ndarray
+        Cumulative population shares, shape (n_points,)
+    lorenz : ndarray
+        Cumulative wealth shares, shape (..., n_points)
+
+    Returns:
+    --------
+    ndarray
+        Gini coefficients (0-1), shape lorenz.shape[:-1]
+    """
+    widths = np.diff(population)
+    heights = lorenz[..., 1:] + lorenz[..., :-1]
+    return 1 - (widths * heights).sum(axis=-1)
+
+
+def gini_consistency(df, country_codes=None):
+    """
+    Compare the Lorenz-implied Gini with the published Gini coefficient.
+
+    Parameters:
+    -----------
+    df : DataFrame
+        Wealth data with a DATE column
+    country_codes : list, optional
+        Country codes (defaults to all configured countries)
+
+    Returns:
+    --------
+    DataFrame
+        One row per country and quarter with the published and implied Gini
+        (both on the published 0-100 scale), their difference and a
+        'monotone' flag that is False when the Lorenz points are not
+        non-decreasing (inconsistent group shares)
+    """
+    dates, codes, population, lorenz = lorenz_points(df, country_codes)
+    _, _, _, published = stack_wealth_metrics(df, codes, ["gini"])
+
+    implied = implied_gini(population, lorenz) * 100
+    monotone = (np.diff(lorenz, axis=-1) >= 0).all(axis=-1)
+
+    n_countries, n_dates = implied.shape
+    result = pd.DataFrame(
+        {
+            "country": np.repeat(codes, n_dates),
+            "DATE": np.tile(dates, n_countries),
+            "gini_published": published[..., 0].ravel(),
+            "gini_implied": implied.ravel(),
+            "monotone": monotone.ravel(),
+        }
+    )
+    result["difference"] = result["gini_published"] - result["gini_implied"]
+    return result.dropna(subset=["gini_published", "gini_implied"]).reset_index(drop=True)
+
+
+# Wealth groups for growth incidence, ordered from poorest to richest,
+# with the WEALTH_METRICS key available for each basis
+GROWTH_GROUPS = {
+    "bottom50": {"total": "net_wealth_bottom50"},
+    "d6": {"total": "net_wealth_d6"},
+    "d7": {"total": "net_wealth_d7"},
+    "d9": {"total": "net_wealth_d9"},
+    "top10": {
+        "total": "net_wealth_top10",
+        "per_capita": "net_wealth_top10_per_capita",
+        "per_household": "net_wealth_top10_per_household",
+    },
+}
+
+
+def growth_incidence(df, origins=("2019-12-31",), country_codes=None, plot=False):
+    """
+    Growth of each wealth group between origin quarters and every later quarter.
+
+    Growth for all countries, groups, origins and targets comes from a single
+    broadcast division of the (country x quarter x group) array.
+
+    Parameters:
+    -----------
+    df : DataFrame
+        Wealth data with a DATE column
+    origins : sequence of str, default=('2019-12-31',)
+        Origin quarter end dates (e.g. 2019Q4 for pre-COVID)
+    country_codes : list, optional
+        Country codes (defaults to all configured countries)
+    plot : bool, default=False
+        Plot the growth incidence curve from the first origin to the last quarter
+
+    Returns:
+    --------
+    DataFrame
+        Tidy table with country, group, basis, origin, DATE, growth_pct and
+        annualized_pct for every target quarter after its origin
+    """
+    series = [
+        (group, basis, key)
+        for group, bases in GROWTH_GROUPS.items()
+        for basis, key in bases.items()
+    ]
+    dates, codes, _, values = stack_wealth_metrics(df, country_codes, [s[2] for s in series])
+
+    origin_dates = pd.DatetimeIndex(origins).to_numpy(dtype=dates.dtype)
+    origin_idx = np.searchsorted(dates, origin_dates)
+    found = origin_idx < len(dates)
+    if not found.all() or (dates[origin_idx] != origin_dates).any():
+        raise ValueError("Every origin must be a quarter end present in the data")
+
+    # (country, origin, target, group) growth ratios in one broadcast
+    base = values[:, origin_idx][:, :, None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = values[:, None, :, :] / base
+        years = years_since(dates[None, :], origin_dates[:, None])[None, :, :, None]
+        annualized = np.where(years > 0, ratio ** (1 / years) - 1, np.nan)
+
+    c_idx, o_idx, t_idx, s_idx = np.meshgrid(
+        np.arange(len(codes)),
+        np.arange(len(origins)),
+        np.arange(len(dates)),
+        np.arange(len(series)),
+        indexing="ij",
+    )
+    keep = (t_idx > origin_idx[o_idx]).ravel()
+    labels = np.array(series, dtype=object)
+
+    result = pd.DataFrame(
+        {
+            "country": np.asarray(codes)[c_idx.ravel()[keep]],
+            "group": labels[s_idx.ravel()[keep], 0],
+            "basis": labels[s_idx.ravel()[keep], 1],
+            "origin": origin_dates[o_idx.ravel()[keep]],
+            "DATE": dates[t_idx.ravel()[keep]],
+            "growth_pct": (ratio - 1).ravel()[keep] * 100,
+            "annualized_pct": annualized.ravel()[keep] * 100,
+        }
+    ).dropna(subset=["growth_pct"])
+    result = result.reset_index(drop=True)
+
+    if plot:
+        from .visualization import plot_growth_incidence
+
+        plot_growth_incidence(result, origin=origin_dates[0], target=dates[-1])
+    return result
@@ -1,9 +1,45 @@
 """Machine learning models for wealth prediction."""
 
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import lsmr, splu
 from sklearn.linear_model import LinearRegression, Ridge
 from sklearn.preprocessing import PolynomialFeatures
 from sklearn.pipeline import make_pipeline
-from .config import WEALTH_METRICS
+from .config import WEALTH_METRICS, COUNTRY_NAMES
+from .data_loader import (
+    stack_wealth_metrics,
+    stack_covid_regressors,
+    unstack_predictions,
+    years_since,
+)
+from .sparse_store import SpanFrame
+from .smoothing import train_predict_smoothing
+from .robust import train_predict_robust
+
+# compare_models() labels for every supported model_type
+MODEL_TYPES = {
+    "Linear": "linear",
+    "Polynomial": "polynomial",
+    "Ridge": "ridge",
+    "Holt": "holt",
+    "Damped Holt": "damped_holt",
+    "Huber": "huber",
+    "Median": "median",
+}
+# compare_models() default; the other families are opt-in via model_types
+DEFAULT_MODELS = ("Linear", "Polynomial", "Ridge")
+
+
+def _training_points(train_df, col):
+    """Return (X, y) training arrays for one metric, without missing values."""
+    if isinstance(train_df, SpanFrame):
+        # Spans already exclude the leading/trailing NaN padding
+        days, values = train_df.span(col)
+        return days.reshape(-1, 1), values
+
+    clean = train_df[["days_since_start", col]].dropna()
+    return clean[["days_since_start"]].to_numpy(), clean[col].to_numpy()
 
 
 def train_predict_country(train_df, test_df, country_code, model_type="linear"):
@@ -14,37 +50,52 @@ def train_predict_country(train_df, test_df, country_code, model_type="linear"):
     - Linear: Simple trend extrapolation (baseline)
     - Polynomial: Captures non-linear patterns (degree 2)
     - Ridge: Regularized polynomial to prevent overfitting
+    - Holt: Exponential smoothing with a linear trend
+    - Damped Holt: Holt smoothing whose trend flattens over the horizon
+    - Huber / Median: Linear trends robust to revisions and one-off jumps
 
     Parameters:
     -----------
-    train_df : DataFrame
+    train_df : DataFrame or SpanFrame
         Training data with 'days_since_start' column
-    test_df : DataFrame
+    test_df : DataFrame or SpanFrame
         Test data with 'days_since_start' column
     country_code : str
         Country code ('DE', 'FR', or 'SI')
     model_type : str, default='linear'
-        Type of model: 'linear', 'polynomial', or 'ridge'
+        Type of model: 'linear', 'polynomial', 'ridge', 'holt', 'damped_holt',
+        'huber' or 'median'
 
     Returns:
     --------
     dict
         Dictionary with metric keys and predicted values arrays
     """
+    if model_type in ("holt", "damped_holt", "huber", "median"):
+        # Batched model families work on the stacked series of the country
+        if isinstance(train_df, SpanFrame):
+            train_df = train_df.to_frame()
+        if model_type in ("holt", "damped_holt"):
+            results = train_predict_smoothing(
+                train_df, test_df, [country_code], damped=model_type == "damped_holt"
+            )
+        else:
+            loss = "huber" if model_type == "huber" else "quantile"
+            results = train_predict_robust(train_df, test_df, [country_code], loss=loss)
+        return results[country_code]
+
     metrics = WEALTH_METRICS[country_code]
     results = {}
 
     # Train a separate model for each wealth metric
+    X_test = test_df["days_since_start"].to_numpy().reshape(-1, 1)
+
     for key, col in metrics.items():
         # Remove rows with missing values
-        clean = train_df[["days_since_start", col]].dropna()
-        if len(clean) < 3:  # Need at least 3 points for polynomial
+        X_train, y_train = _training_points(train_df, col)
+        if len(y_train) < 3:  # Need at least 3 points for polynomial
             continue
 
-        X_train = clean[["days_since_start"]]
-        y_train = clean[col]
-        X_test = test_df[["days_since_start"]]
-
         # Select and train model based on type
         if model_type == "linear":
             # Simple linear regression: y = a*x + b
@@ -68,12 +119,13 @@ def train_predict_country(train_df, test_df, country_code, model_type="linear"):
     return results
 
 
-def compare_models(train_df, test_df, country_code):
+def compare_models(train_df, test_df, country_code, model_types=None):
     """
     Compare multiple prediction models for a country and visualize results.
 
-    Trains and evaluates Linear, Polynomial, and Ridge models to identify
-    which approach best captures pre-pandemic trends.
+    Trains and evaluates any of the MODEL_TYPES (Linear, Polynomial, Ridge,
+    Holt, Damped Holt, Huber and Median) to identify which approach best
+    captures pre-pandemic trends.
 
     Parameters:
     -----------
@@ -83,17 +135,156 @@ def compare_models(train_df, test_df, country_code):
         Test data with 'days_since_start' column
     country_code : str
         Country code ('DE', 'FR', or 'SI')
+    model_types : list, optional
+        Model names from MODEL_TYPES to compare (defaults to DEFAULT_MODELS:
+        Linear, Polynomial and Ridge)
 
     Returns:
     --------
     dict
         Dictionary with model names as keys and prediction dictionaries as values
     """
+    names = DEFAULT_MODELS if model_types is None else model_types
     models = {
-        "Linear": train_predict_country(train_df, test_df, country_code, "linear"),
-        "Polynomial": train_predict_country(
-            train_df, test_df, country_code, "polynomial"
-        ),
-        "Ridge": train_predict_country(train_df, test_df, country_code, "ridge"),
+        name: train_predict_country(train_df, test_df, country_code, MODEL_TYPES[name])
+        for name in names
     }
     return models
+
+
+def _panel_design(n_countries, years, covid, trend):
+    """
+    Sparse panel design matrix with one row per (country, date).
+
+    Columns: country fixed effects, then either one trend per country or a
+    common trend, then the (pooled) COVID-19 regressors.
+    """
+    n_dates = len(years)
+    n_rows = n_countries * n_dates
+    country = np.repeat(np.arange(n_countries), n_dates)
+    t = np.tile(years, n_countries)
+    rows = np.arange(n_rows)
+
+    trend_col = n_countries + (country if trend == "country" else np.zeros_like(country))
+    n_trend = n_countries if trend == "country" else 1
+
+    row_idx = [rows, rows]
+    col_idx = [country, trend_col]
+    data = [np.ones(n_rows), t]
+
+    n_covid = 0 if covid is None else covid.shape[-1]
+    for k in range(n_covid):
+        row_idx.append(rows)
+        col_idx.append(np.full(n_rows, n_countries + n_trend + k))
+        data.append(covid[..., k].ravel())
+
+    design = sparse.csr_matrix(
+        (np.concatenate(data), (np.concatenate(row_idx), np.concatenate(col_idx))),
+        shape=(n_rows, n_countries + n_trend + n_covid),
+    )
+    # Zero COVID-19 values (e.g. pre-pandemic quarters) are not stored, so
+    # regressors without variation in a window show up as empty columns
+    design.eliminate_zeros()
+    return design
+
+
+def train_predict_panel(
+    train_df,
+    test_df,
+    country_codes=None,
+    metrics=None,
+    trend="country",
+    df_covid_quarterly=None,
+    covid_cols=("cases_per_100k", "deaths_per_100k"),
+):
+    """
+    Pooled panel model with country fixed effects, fitted for all metrics at once.
+
+    Every metric is regressed on country fixed effects, a time trend (per
+    country or common) and, optionally, COVID-19 regressors whose effect is
+    shared across countries. The panel is one sparse design matrix; all
+    metrics are solved as multiple right-hand sides of its factorized normal
+    equations, so cost grows linearly with the number of countries.
+
+    Parameters:
+    -----------
+    train_df : DataFrame
+        Training data with a DATE column
+    test_df : DataFrame
+        Test data with a DATE column
+    country_codes : list, optional
+        Country codes (defaults to all configured countries)
+    metrics : list, optional
+        Metric keys from WEALTH_METRICS (defaults to all)
+    trend : str, default='country'
+        'country' for country-specific trends, 'common' for one shared trend
+    df_covid_quarterly : DataFrame, optional
+        Output of aggregate_covid_quarterly(); adds pooled COVID-19 regressors
+        (quarters without COVID-19 records count as zero). The training window
+        must include COVID-19 quarters for these to be identified.
+    covid_cols : sequence of str
+        COVID-19 regressors to use with df_covid_quarterly
+
+    Returns:
+    --------
+    dict
+        Country code -> {metric key: predicted values for test_df rows},
+        the format of train_predict_country()
+    """
+    if trend not in ("country", "common"):
+        raise ValueError(f"Unknown trend: {trend}")
+
+    train_dates, codes, metrics, y_train = stack_wealth_metrics(train_df, country_codes, metrics)
+    test_dates, _, _, _ = stack_wealth_metrics(test_df, codes, metrics[:1])
+
+    # Time in years since the training start keeps the normal equations well scaled
+    origin = train_dates[0]
+
+    covid_train = covid_test = None
+    if df_covid_quarterly is not None:
+        names = [COUNTRY_NAMES[code] for code in codes]
+        covid_train = np.nan_to_num(
+            stack_covid_regressors(df_covid_quarterly, train_dates, names, covid_cols, 0.0)
+        )
+        covid_test = np.nan_to_num(
+            stack_covid_regressors(df_covid_quarterly, test_dates, names, covid_cols, 0.0)
+        )
+
+    X_train = _panel_design(len(codes), years_since(train_dates, origin), covid_train, trend)
+    X_test = _panel_design(len(codes), years_since(test_dates, origin), covid_test, trend)
+
+    # (country * date, metric) responses; metrics sharing a missing-value
+    # pattern share one factorization
+    Y = y_train.reshape(-1, len(metrics))
+    observed = ~np.isnan(Y)
+    coef = np.full((X_train.shape[1], len(metrics)), np.nan)
+
+    patterns = {}
+    for m in range(len(metrics)):
+        patterns.setdefault(observed[:, m].tobytes(), []).append(m)
+
+    for columns in patterns.values():
+        mask = observed[:, columns[0]]
+        X = X_train[mask]
+        # Drop parameters without data (e.g. a country missing this metric)
+        used = np.flatnonzero(X.getnnz(axis=0))
+        X = X[:, used]
+        if X.shape[0] <= X.shape[1]:
+            continue
+        normal = (X.T @ X).tocsc()
+        rhs = X.T @ Y[mask][:, columns]
+        try:
+            coef[np.ix_(used, columns)] = splu(normal).solve(np.asarray(rhs))
+        except RuntimeError:
+            # Singular system (e.g. collinear COVID regressors): sparse least
+            # squares, which converges to the minimum-norm solution
+            for m in columns:
+                coef[used, m] = lsmr(X, Y[mask, m], atol=1e-12, btol=1e-12)[0]
+
+    predictions = X_test @ np.nan_to_num(coef)
+    predictions = predictions.reshape(len(codes), len(test_dates), len(metrics))
+
+    # A country's own fixed effect is NaN when it has no training data for a
+    # metric (e.g. a series starting after the training window)
+    fitted = ~np.isnan(coef[: len(codes)])
+    return unstack_predictions(predictions.transpose(0, 2, 1), codes, metrics, fitted)
@@ -0,0 +1,183 @@
+"""Lazy, projection- and predicate-aware reads of the source datasets."""
+
+import numpy as np
+import pandas as pd
+from .config import DF_PATH, COVID_PATH, WEALTH_METRICS
+from .data_loader import cache_is_fresh, read_cache, parse_wealth_dates, parse_covid_dates
+
+# How each source stores and parses its date column
+_SOURCES = {
+    "wealth": {"raw_date": "DATE", "date": "DATE", "parse": parse_wealth_dates},
+    "covid": {"raw_date": "dateRep", "date": "date", "parse": parse_covid_dates},
+}
+
+
+class LazyFrame:
+    """
+    Deferred read of a dataset file.
+
+    Column selections, a date range and value filters are only recorded;
+    `collect()` pushes them into the read: the CSV is parsed with `usecols`,
+    rows outside the filters are skipped after a scan of the predicate
+    columns alone, and a fresh binary cache is used instead when one exists.
+    Every method returns a new LazyFrame.
+    """
+
+    def __init__(self, path, source, columns=None, start=None, end=None, filters=None):
+        self.path = path
+        self.source = source
+        self.columns = columns
+        self.start = start
+        self.end = end
+        self.filters = filters or {}
+
+    def _replace(self, **changes):
+        state = {
+            "path": self.path,
+            "source": self.source,
+            "columns": self.columns,
+            "start": self.start,
+            "end": self.end,
+            "filters": dict(self.filters),
+        }
+        state.update(changes)
+        return LazyFrame(**state)
+
+    def select(self, columns):
+        """Keep only these raw columns (the date column is always kept)."""
+        return self._replace(columns=list(dict.fromkeys(columns)))
+
+    def between(self, start_date=None, end_date=None):
+        """Keep rows whose date lies in [start_date, end_date]."""
+        return self._replace(start=start_date, end=end_date)
+
+    def where_in(self, column, values):
+        """Keep rows whose `column` value is one of `values`."""
+        filters = dict(self.filters)
+        filters[column] = list(values)
+        return self._replace(filters=filters)
+
+    def explain(self):
+        """Describe how collect() will read the data."""
+        return {
+            "path": self.path,
+            "from_cache": cache_is_fresh(self.path),
+            "usecols": self._usecols(),
+            "date_range": (self.start, self.end),
+            "filters": self.filters,
+        }
+
+    def _usecols(self):
+        if self.columns is None:
+            return None
+        spec = _SOURCES[self.source]
+        return list(dict.fromkeys([spec["raw_date"]] + self.columns + list(self.filters)))
+
+    def _row_mask(self, frame, date_col, parsed):
+        """Boolean mask of rows passing the date range and value filters."""
+        mask = np.ones(len(frame), dtype=bool)
+        if self.start is not None or self.end is not None:
+            dates = frame[date_col] if parsed else _SOURCES[self.source]["parse"](
+                frame[[date_col]].copy()
+            )[_SOURCES[self.source]["date"]]
+            if self.start is not None:
+                mask &= (dates >= pd.Timestamp(self.start)).to_numpy()
+            if self.end is not None:
+                mask &= (dates <= pd.Timestamp(self.end)).to_numpy()
+        for column, values in self.filters.items():
+            mask &= frame[column].isin(values).to_numpy()
+        return mask
+
+    def collect(self):
+        """
+        Execute the read.
+
+        Returns:
+        --------
+        DataFrame
+            Selected columns and rows with parsed dates; wealth data read
+            with a date range also gets 'days_since_start', as from
+            filter_wealth_data()
+        """
+        spec = _SOURCES[self.source]
+        usecols = self._usecols()
+
+        cached = read_cache(self.path)
+        if cached is not None:
+            df = cached.loc[self._row_mask(cached, spec["date"], parsed=True)]
+            if usecols is not None:
+                wanted = set(usecols) | {spec["date"]}
+                df = df[[c for c in df.columns if c in wanted]]
+            df = df.copy()
+        else:
+            skiprows = None
+            if self.start is not None or self.end is not None or self.filters:
+                # Scan only the predicate columns to find the rows to skip
+                predicate_cols = [spec["raw_date"]] + list(self.filters)
+                scan = pd.read_csv(self.path, usecols=predicate_cols)
+                keep = self._row_mask(scan, spec["raw_date"], parsed=False)
+                skiprows = (np.flatnonzero(~keep) + 1).tolist()  # +1: header line
+            df = pd.read_csv(self.path, usecols=usecols, skiprows=skiprows)
+            df = spec["parse"](df)
+
+        df = df.reset_index(drop=True)
+        if self.source == "wealth" and (self.start is not None or self.end is not None):
+            df["days_since_start"] = (df["DATE"] - df["DATE"].min()).dt.days
+        return df
+
+
+def scan_wealth(path=DF_PATH, countries=None, metrics=None):
+    """
+    Start a lazy read of the wealth dataset.
+
+    Parameters:
+    -----------
+    path : str
+        Path to wealth distribution CSV file
+    countries : list, optional
+        Country codes whose WEALTH_METRICS columns to read
+    metrics : list, optional
+        Metric keys to read (defaults to all configured metrics)
+
+    Returns:
+    --------
+    LazyFrame
+        Nothing is read until .collect()
+
+    Example:
+    --------
+    >>> scan_wealth(countries=["DE"]).between("2016-01-01", "2025-12-31").collect()
+    """
+    lazy = LazyFrame(path, "wealth")
+    if countries is None and metrics is None:
+        return lazy
+    countries = list(WEALTH_METRICS) if countries is None else countries
+    columns = [
+        col
+        for code in countries
+        for key, col in WEALTH_METRICS[code].items()
+        if metrics is None or key in metrics
+    ]
+    return lazy.select(columns)
+
+
+def scan_covid(path=COVID_PATH, countries=None):
+    """
+    Start a lazy read of the COVID-19 dataset.
+
+    Parameters:
+    -----------
+    path : str
+        Path to COVID-19 CSV file
+    countries : list, optional
+        Country names to keep
+
+    Returns:
+    --------
+    LazyFrame
+        Nothing is read until .collect()
+    """
+    lazy = LazyFrame(path, "covid")
+    if countries is not None:
+        lazy = lazy.where_in("countriesAndTerritories", countries)
+    return lazy
@@ -0,0 +1,379 @@
+"""Asynchronous refresh of the source datasets from remote endpoints.
+
+Usage:
+    python -m helpers.refresh [--covid-url URL] [--wealth-url URL]
+                              [--proxy http://host:port] [--timeout SECONDS]
+                              [--no-rebuild] [--no-validate]
+
+Each source is fetched concurrently with a conditional GET (ETag /
+If-Modified-Since), so unchanged files cost one round trip and no transfer.
+Changed files are written atomically into `datasets/` and their binary
+cache is rebuilt and validated (findings go to a `.validation.csv` next to
+the cache). Only the standard library is used: HTTP/1.1 keep-alive
+connections are pooled per host and reused across requests.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import ssl
+import sys
+import tempfile
+from urllib.parse import urlsplit, urljoin
+
+from .config import DF_PATH, COVID_PATH, SOURCE_URLS
+from .data_loader import (
+    cache_path,
+    rebuild_cache,
+    load_wealth_data,
+    load_covid_data,
+)
+from .validation import validate, dataset_rules
+
+# Local file and loader for each refreshable dataset
+DATASETS = {
+    "wealth": (DF_PATH, load_wealth_data),
+    "covid": (COVID_PATH, load_covid_data),
+}
+
+_CHUNK_SIZE = 1 << 16
+_MAX_REDIRECTS = 5
+
+
+class _ConnectionPool:
+    """Keep-alive HTTP/1.1 connections, pooled per (scheme, host, port)."""
+
+    def __init__(self, proxy=None):
+        self.proxy = urlsplit(proxy) if proxy else None
+        self._idle = {}
+
+    async def acquire(self, scheme, host, port):
+        key = (scheme, host, port)
+        while self._idle.get(key):
+            reader, writer = self._idle[key].pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        return await self._open(scheme, host, port)
+
+    def release(self, key, conn, reusable):
+        if reusable:
+            self._idle.setdefault(key, []).append(conn)
+        else:
+            conn[1].close()
+
+    async def _open(self, scheme, host, port):
+        ctx = ssl.create_default_context() if scheme == "https" else None
+        if self.proxy is None:
+            return await asyncio.open_connection(
+                host, port, ssl=ctx, server_hostname=host if ctx else None
+            )
+
+        reader, writer = await asyncio.open_connection(
+            self.proxy.hostname, self.proxy.port or 80
+        )
+        if ctx is not None:
+            # Tunnel TLS through the proxy
+            writer.write(
+                f"CONNECT {host}:{port} HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode()
+            )
+            await writer.drain()
+            status, _ = await _read_head(reader)
+            if status != 200:
+                writer.close()
+                raise ConnectionError(f"Proxy CONNECT to {host}:{port} failed ({status})")
+            await writer.start_tls(ctx, server_hostname=host)
+        return reader, writer
+
+    def close(self):
+        for conns in self._idle.values():
+            for _, writer in conns:
+                writer.close()
+        self._idle.clear()
+
+
+async def _read_head(reader):
+    """Read a status line and headers; return (status, lower-cased headers)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed before response")
+    status = int(status_line.split()[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, headers
+
+
+async def _read_body(reader, headers, sink):
+    """Stream a response body into `sink`; return False if the connection must close."""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                # Trailer section ends with an empty line
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return True
+            sink(await reader.readexactly(size))
+            await reader.readline()
+
+    if "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining:
+            chunk = await reader.read(min(remaining, _CHUNK_SIZE))
+            if not chunk:
+                raise ConnectionError("Connection closed mid-body")
+            sink(chunk)
+            remaining -= len(chunk)
+        return True
+
+    # No framing: body runs until the server closes the connection
+    while chunk := await reader.read(_CHUNK_SIZE):
+        sink(chunk)
+    return False
+
+
+async def _get(pool, url, headers, sink):
+    """
+    Perform a GET request, following redirects.
+
+    Returns:
+    --------
+    tuple
+        (status, response headers); the body of a 200 response goes to `sink`
+    """
+    for _ in range(_MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        if pool.proxy is not None and parts.scheme == "http":
+            target = url  # absolute-form for plain HTTP proxies
+
+        lines = [f"GET {target} HTTP/1.1", f"Host: {parts.netloc}"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        conn = await pool.acquire(*key)
+        reader, writer = conn
+        try:
+            writer.write(request)
+            await writer.drain()
+            status, resp_headers = await _read_head(reader)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # A pooled connection may have been dropped by the server; retry fresh
+            writer.close()
+            conn = await pool._open(*key)
+            reader, writer = conn
+            writer.write(request)
+            await writer.drain()
+            status, resp_headers = await _read_head(reader)
+
+        if status in (204, 304) or 100 <= status < 200:
+            reusable = True
+        else:
+            reusable = await _read_body(
+                reader, resp_headers, sink if status == 200 else (lambda _: None)
+            )
+        reusable = reusable and resp_headers.get("connection", "").lower() != "close"
+        pool.release(key, conn, reusable)
+
+        if status in (301, 302, 303, 307, 308) and "location" in resp_headers:
+            url = urljoin(url, resp_headers["location"])
+            continue
+        return status, resp_headers
+
+    raise ConnectionError(f"Too many redirects for {url}")
+
+
+def _state_path(path):
+    """Sidecar file holding ETag / Last-Modified validators for a dataset."""
+    return cache_path(path) + ".source.json"
+
+
+def _load_state(path):
+    try:
+        with open(_state_path(path)) as fh:
+            return json.load(fh)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_state(path, state):
+    target = _state_path(path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target + ".tmp", "w") as fh:
+        json.dump(state, fh)
+    os.replace(target + ".tmp", target)
+
+
+async def refresh_dataset(pool, name, url, path):
+    """
+    Conditionally download one dataset and atomically replace the local file.
+
+    Parameters:
+    -----------
+    pool : _ConnectionPool
+        Shared connection pool
+    name : str
+        Dataset key ('wealth' or 'covid')
+    url : str
+        Source URL
+    path : str
+        Local CSV path to update
+
+    Returns:
+    --------
+    str
+        'updated' or 'not modified'
+    """
+    state = _load_state(path)
+    headers = {"Accept-Encoding": "identity", "Connection": "keep-alive"}
+    if os.path.exists(path) and state.get("url") == url:
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{name}-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            status, resp_headers = await _get(pool, url, headers, fh.write)
+            fh.flush()
+            os.fsync(fh.fileno())
+
+        if status == 304:
+            os.unlink(tmp)
+            return "not modified"
+        if status != 200:
+            raise ConnectionError(f"{name}: GET {url} returned HTTP {status}")
+
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+    _save_state(
+        path,
+        {
+            "url": url,
+            "etag": resp_headers.get("etag"),
+            "last_modified": resp_headers.get("last-modified"),
+        },
+    )
+    return "updated"
+
+
+async def refresh_all(urls=None, proxy=None, timeout=60.0, rebuild=True):
+    """
+    Refresh every configured dataset concurrently.
+
+    Parameters:
+    -----------
+    urls : dict, optional
+        Dataset key to source URL (defaults to config.SOURCE_URLS); None skips it
+    proxy : str, optional
+        HTTP proxy URL, e.g. 'http://proxy:3128'
+    timeout : float, default=60.0
+        Time budget of each download in seconds; a dataset that runs out
+        reports a TimeoutError
+    rebuild : bool, default=True
+        Rebuild the binary cache of each updated dataset
+
+    Returns:
+    --------
+    dict
+        Dataset key to 'updated', 'not modified', 'skipped' or the raised error
+    """
+    urls = {**SOURCE_URLS, **(urls or {})}
+    pool = _ConnectionPool(proxy)
+    results = {name: "skipped" for name in DATASETS}
+
+    active = [name for name in DATASETS if urls.get(name)]
+    try:
+        # Per-dataset timeouts: a slow source fails alone, the others are kept
+        outcomes = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    refresh_dataset(pool, name, urls[name], DATASETS[name][0]), timeout
+                )
+                for name in active
+            ),
+            return_exceptions=True,
+        )
+    finally:
+        pool.close()
+
+    for name, outcome in zip(active, outcomes):
+        results[name] = outcome
+        if outcome == "updated" and rebuild:
+            path, loader = DATASETS[name]
+            rebuild_cache(path, loader)
+    return results
+
+
+def validate_dataset(name):
+    """
+    Validate a refreshed dataset and write its findings next to the cache.
+
+    Parameters:
+    -----------
+    name : str
+        Dataset key from DATASETS
+
+    Returns:
+    --------
+    DataFrame
+        validate() report
+    """
+    path, loader = DATASETS[name]
+    report = validate(loader(path, use_cache=True), dataset_rules(name))
+    report.to_csv(cache_path(path) + ".validation.csv", index=False)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh source datasets")
+    parser.add_argument("--wealth-url", default=SOURCE_URLS["wealth"])
+    parser.add_argument("--covid-url", default=SOURCE_URLS["covid"])
+    parser.add_argument("--proxy", default=os.environ.get("HTTPS_PROXY"))
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--no-rebuild", action="store_true")
+    parser.add_argument("--no-validate", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(
+        refresh_all(
+            {"wealth": args.wealth_url, "covid": args.covid_url},
+            proxy=args.proxy,
+            timeout=args.timeout,
+            rebuild=not args.no_rebuild,
+        )
+    )
+    failed = False
+    for name, outcome in results.items():
+        if isinstance(outcome, BaseException):
+            failed = True
+            outcome = f"failed: {outcome}"
+        elif outcome == "updated" and not args.no_validate:
+            report = validate_dataset(name)
+            errors = int((report["severity"] == "error").sum())
+            outcome = f"{outcome} ({len(report)} validation findings, {errors} errors)"
+        print(f"{name}: {outcome}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
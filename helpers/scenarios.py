@@ -0,0 +1,309 @@
+"""Monte Carlo counterfactual scenarios for alternative pandemic intensities."""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from .config import COUNTRY_NAMES
+from .data_loader import stack_wealth_metrics, stack_covid_regressors, years_since
+
+COVID_COLS = ("cases_per_100k", "deaths_per_100k")
+FAN_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def fit_covid_trends(
+    df_wealth, df_covid_quarterly, country_codes=None, metrics=None, covid_cols=COVID_COLS
+):
+    """
+    Fit a linear trend plus COVID-19 severity effects to every wealth series.
+
+    Each (country, metric) series is regressed on a constant, time (years)
+    and the country's quarterly COVID-19 regressors; all series are solved
+    as one batch of masked normal equations.
+
+    Parameters:
+    -----------
+    df_wealth : DataFrame
+        Wealth data with a DATE column, spanning pre-pandemic and pandemic
+        quarters (e.g. filter_wealth_data output)
+    df_covid_quarterly : DataFrame
+        Output of aggregate_covid_quarterly() for the same countries;
+        quarters outside its range count as zero
+    country_codes : list, optional
+        Country codes (defaults to all configured countries)
+    metrics : list, optional
+        Metric keys from WEALTH_METRICS (defaults to all)
+    covid_cols : sequence of str
+        COVID-19 regressors
+
+    Returns:
+    --------
+    dict
+        Fitted model: dates, codes, metrics, covid_cols, observed values,
+        design pieces, coefficients with their covariance and residual
+        standard deviation per series
+    """
+    dates, codes, metrics, values = stack_wealth_metrics(df_wealth, country_codes, metrics)
+    names = [COUNTRY_NAMES[code] for code in codes]
+    covid = np.nan_to_num(
+        stack_covid_regressors(df_covid_quarterly, dates, names, list(covid_cols), 0.0)
+    )
+    # Regressors on a unit scale keep the normal equations well conditioned
+    covid_scale = covid.reshape(-1, covid.shape[-1]).std(axis=0)
+    covid_scale[covid_scale == 0] = 1.0
+
+    years = years_since(dates, dates[0])
+    trend = np.column_stack([np.ones_like(years), years])
+    X = np.concatenate(
+        [np.broadcast_to(trend, (len(codes),) + trend.shape), covid / covid_scale], axis=-1
+    )
+
+    # (country, metric, date) responses with a missing-value mask as weights
+    Y = values.transpose(0, 2, 1)
+    observed = ~np.isnan(Y)
+    W = observed.astype("float64")
+    Y0 = np.where(observed, Y, 0.0)
+
+    xtx = np.einsum("ctp,cmt,ctq->cmpq", X, W, X)
+    xty = np.einsum("ctp,cmt->cmp", X, W * Y0)
+    xtx_inv = np.linalg.pinv(xtx)
+    coef = np.einsum("cmpq,cmq->cmp", xtx_inv, xty)
+
+    n_params = X.shape[-1]
+    residuals = np.where(observed, Y0 - np.einsum("ctp,cmp->cmt", X, coef), 0.0)
+    dof = observed.sum(axis=-1) - n_params
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma = np.sqrt((residuals**2).sum(axis=-1) / dof)
+    usable = dof > 0
+    coef[~usable] = np.nan
+    sigma[~usable] = np.nan
+
+    return {
+        "dates": dates,
+        "codes": codes,
+        "metrics": metrics,
+        "covid_cols": list(covid_cols),
+        "observed": Y,
+        "trend": trend,
+        "covid": covid,
+        "covid_scale": covid_scale,
+        "coef": coef,
+        "cov": (sigma**2)[..., None, None] * xtx_inv,
+        "sigma": sigma,
+    }
+
+
+def donor_paths(model, df_covid_quarterly, donors=None):
+    """
+    COVID-19 paths of other territories on the model's quarters.
+
+    Parameters:
+    -----------
+    model : dict
+        Output of fit_covid_trends()
+    df_covid_quarterly : DataFrame
+        aggregate_covid_quarterly() output covering the donor countries
+    donors : list, optional
+        Country names (defaults to every territory in df_covid_quarterly)
+
+    Returns:
+    --------
+    ndarray
+        Donor regressors shaped (n_donors, n_dates, n_covid_cols)
+    """
+    if donors is None:
+        donors = sorted(df_covid_quarterly["countriesAndTerritories"].unique())
+    paths = stack_covid_regressors(
+        df_covid_quarterly, model["dates"], donors, model["covid_cols"], 0.0
+    )
+    return np.nan_to_num(paths)
+
+
+def _draw(values, rng, n_paths, integer=False):
+    """
+    n_paths draws of a scenario setting: a constant, a (low, high) range or a list.
+
+    Ranges are uniform; with integer=True they are drawn over the whole
+    numbers low..high, both ends included.
+    """
+    if np.isscalar(values):
+        return np.full(n_paths, values)
+    if isinstance(values, tuple) and len(values) == 2:
+        if integer:
+            return rng.integers(values[0], values[1] + 1, n_paths)
+        return rng.uniform(values[0], values[1], n_paths)
+    return rng.choice(np.asarray(values), n_paths)
+
+
+def _scenario_covid(covid, donors, picks, lags, factors):
+    """Alternative COVID-19 regressors of one country, shaped (paths, dates, cols)."""
+    n_dates = covid.shape[0]
+    if donors is None:
+        source = np.broadcast_to(covid, (len(lags),) + covid.shape)
+    else:
+        # Each path borrows the waves of a random donor territory
+        source = donors[picks]
+
+    # Shift waves by whole quarters (later when positive), filling with zero
+    t = np.arange(n_dates)[None, :] - lags[:, None]
+    valid = (t >= 0) & (t < n_dates)
+    shifted = np.take_along_axis(source, np.clip(t, 0, n_dates - 1)[:, :, None], axis=1)
+    return shifted * (valid * factors[:, None])[:, :, None]
+
+
+def _fan(paths, quantiles):
+    """Quantiles over the path axis of a (paths, metrics, dates) array."""
+    # Paths on the last, contiguous axis make the quantile pass cache friendly
+    stacked = paths.reshape(len(paths), -1).astype("float32").T.copy()
+    fans = np.quantile(stacked, quantiles, axis=1)
+    return fans.reshape((len(quantiles),) + paths.shape[1:])
+
+
+# Simulation inputs shared by the countries of one simulate_scenarios() call;
+# set once per worker process by the pool initializer
+_STATE = None
+
+
+def _init_state(state):
+    global _STATE
+    _STATE = state
+
+
+def _simulate_country(c):
+    """
+    Simulate every path of one country; returns (level, effect) quantiles.
+
+    Draws come from the country's own seed, so a country's paths do not
+    depend on which process simulates it.
+    """
+    model, quantiles = _STATE["model"], _STATE["quantiles"]
+    lags, factors, donors = _STATE["lags"], _STATE["factors"], _STATE["donors"]
+    rng = np.random.default_rng(_STATE["seeds"][c])
+    n_paths = len(lags)
+    coef = np.nan_to_num(model["coef"][c])
+    n_metrics, n_params = coef.shape
+    n_dates = len(model["dates"])
+
+    # Parameter uncertainty: coef + A e with A A' = cov (eigen square root)
+    eigval, eigvec = np.linalg.eigh(np.nan_to_num(model["cov"][c]))
+    root = eigvec * np.sqrt(np.clip(eigval, 0, None))[..., None, :]
+    noise = rng.standard_normal((n_paths, n_metrics, n_params))
+    beta = coef + np.einsum("mpq,nmq->nmp", root, noise)
+
+    picks = None if donors is None else rng.integers(0, len(donors), n_paths)
+    covid = _scenario_covid(model["covid"][c], donors, picks, lags, factors)
+    covid = covid / model["covid_scale"]
+    actual = model["covid"][c] / model["covid_scale"]
+
+    n_trend = model["trend"].shape[1]
+    trend_part = beta[..., :n_trend] @ model["trend"].T
+    covid_part = beta[..., n_trend:] @ covid.transpose(0, 2, 1)
+    actual_part = beta[..., n_trend:] @ actual.T
+    residual = np.nan_to_num(model["sigma"][c])[None, :, None] * rng.standard_normal(
+        (n_paths, n_metrics, n_dates)
+    )
+
+    levels = trend_part + covid_part + residual
+    effects = covid_part - actual_part
+    return _fan(levels, quantiles), _fan(effects, quantiles)
+
+
+def simulate_scenarios(
+    model,
+    n_paths=1000,
+    scale=1.0,
+    shift=0,
+    donors=None,
+    seed=0,
+    n_jobs=1,
+    quantiles=FAN_QUANTILES,
+):
+    """
+    Simulate counterfactual wealth paths under alternative COVID-19 intensities.
+
+    Coefficients are drawn from their estimated covariance and residual
+    noise is added. Scenario settings (scale, shift) are drawn once per path
+    and shared by all countries; each country is then simulated as one
+    (paths x metrics x quarters) array from its own SeedSequence child, and
+    reduced to quantiles where it was simulated. Results depend on seed but
+    not on n_jobs.
+
+    Parameters:
+    -----------
+    model : dict
+        Output of fit_covid_trends()
+    n_paths : int, default=1000
+        Number of simulated paths
+    scale : float, (low, high) tuple or list, default=1.0
+        Multiplier of the COVID-19 path (0.5 = waves half as severe); a tuple
+        draws uniformly per path, a list draws from its values
+    shift : int, (low, high) tuple or list, default=0
+        Wave shift in whole quarters (positive = later); a tuple draws
+        integers uniformly from low to high inclusive
+    donors : ndarray, optional
+        donor_paths() output; each path then replaces a country's waves with
+        those of a random donor territory
+    seed : int, default=0
+        Seed of the simulation SeedSequence
+    n_jobs : int, default=1
+        Worker processes; countries are distributed over them and the model
+        is sent to each worker once
+    quantiles : sequence of float
+        Fan chart quantiles
+
+    Returns:
+    --------
+    DataFrame
+        One row per country, metric and quarter with the observed value, the
+        fit under the actual pandemic, level quantiles ('q05', ...) and
+        quantiles of the effect relative to the actual pandemic ('effect_q05', ...)
+    """
+    scenario_seed, country_seed = np.random.SeedSequence(seed).spawn(2)
+    rng = np.random.default_rng(scenario_seed)
+    n_countries = len(model["codes"])
+    state = {
+        "model": model,
+        "quantiles": quantiles,
+        "lags": _draw(shift, rng, n_paths, integer=True).astype(int),
+        "factors": _draw(scale, rng, n_paths),
+        "donors": donors,
+        "seeds": country_seed.spawn(n_countries),
+    }
+
+    if n_jobs > 1 and n_countries > 1:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, initializer=_init_state, initargs=(state,)
+        ) as pool:
+            fans = list(pool.map(_simulate_country, range(n_countries)))
+    else:
+        _init_state(state)
+        try:
+            fans = [_simulate_country(c) for c in range(n_countries)]
+        finally:
+            _init_state(None)
+
+    level_q = np.stack([f[0] for f in fans], axis=1)
+    effect_q = np.stack([f[1] for f in fans], axis=1)
+
+    coef = model["coef"]
+    n_trend = model["trend"].shape[1]
+    fitted = np.einsum("tq,cmq->cmt", model["trend"], coef[..., :n_trend]) + np.einsum(
+        "ctk,cmk->cmt", model["covid"] / model["covid_scale"], coef[..., n_trend:]
+    )
+
+    n_countries, n_metrics, n_dates = fitted.shape
+    result = pd.DataFrame(
+        {
+            "country": np.repeat(model["codes"], n_metrics * n_dates),
+            "metric": np.tile(np.repeat(model["metrics"], n_dates), n_countries),
+            "DATE": np.tile(model["dates"], n_countries * n_metrics),
+            "observed": model["observed"].ravel(),
+            "fitted": fitted.ravel(),
+        }
+    )
+    for i, q in enumerate(quantiles):
+        label = f"q{round(q * 100):02d}"
+        result[label] = level_q[i].ravel()
+        result[f"effect_{label}"] = effect_q[i].ravel()
+    # Series without a fit have no simulation
+    return result[np.isfinite(result["fitted"])].reset_index(drop=True)
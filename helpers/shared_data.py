@@ -0,0 +1,277 @@
+"""Shared-memory dataset handles for multi-process workers."""
+
+import atexit
+import os
+import uuid
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+from .data_loader import load_wealth_data, load_covid_data
+
+# Segments created by this process, unlinked automatically at interpreter exit
+_OWNED_SEGMENTS = {}
+_OWNER_PID = os.getpid()
+
+
+def _code_dtype(n_categories):
+    """Integer dtype pandas uses for Categorical codes with this many categories."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _column_blocks(df):
+    """
+    Group DataFrame columns into homogeneous storage blocks.
+
+    Numeric and datetime columns are stored with their own dtype (datetimes as
+    int64 nanoseconds). Any other column (country names, date strings, ...) is
+    factorized into codes, with its categories kept in the metadata; codes use
+    the smallest integer type pandas keeps for that many categories, so the
+    rebuilt Categorical can use them in place.
+
+    Returns:
+    --------
+    list of dict
+        One entry per block with 'kind', 'dtype', 'columns' and 'values'
+    """
+    blocks = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_dtype(series.dtype):
+            key = ("datetime", "int64")
+            values = series.to_numpy(dtype="datetime64[ns]").view("int64")
+            extra = None
+        elif pd.api.types.is_numeric_dtype(series.dtype) and not (
+            pd.api.types.is_bool_dtype(series.dtype) and series.hasnans
+        ):
+            values = series.to_numpy()
+            key = ("numeric", values.dtype.str)
+            extra = None
+        else:
+            codes, uniques = pd.factorize(series)
+            values = codes.astype(_code_dtype(len(uniques)))
+            key = ("category", values.dtype.str)
+            extra = list(uniques)
+
+        block = blocks.setdefault(
+            key,
+            {"kind": key[0], "dtype": key[1], "columns": [], "values": [], "categories": []},
+        )
+        block["columns"].append(col)
+        block["values"].append(values)
+        block["categories"].append(extra)
+
+    return list(blocks.values())
+
+
+class SharedDataset:
+    """
+    Handle on a DataFrame stored column-wise in a shared-memory segment.
+
+    The publishing process owns the segment and unlinks it on close (or at
+    exit). Attached workers only map it, and get read-only views: every
+    column of `frame` points straight into the shared buffer, nothing is
+    copied or pickled apart from the small metadata dict in `spec`.
+    """
+
+    def __init__(self, shm, spec, owner):
+        self._shm = shm
+        self.spec = spec
+        self.owner = owner
+        self.frame = self._build_frame()
+
+    def _build_frame(self):
+        """Rebuild the DataFrame as views into the shared buffer."""
+        nrows = self.spec["nrows"]
+        data = {}
+        for block in self.spec["blocks"]:
+            arr = np.ndarray(
+                (len(block["columns"]), nrows),
+                dtype=np.dtype(block["dtype"]),
+                buffer=self._shm.buf,
+                offset=block["offset"],
+            )
+            arr.flags.writeable = False
+
+            for i, col in enumerate(block["columns"]):
+                if block["kind"] == "datetime":
+                    data[col] = arr[i].view("datetime64[ns]")
+                elif block["kind"] == "category":
+                    # Codes already have the dtype pandas keeps, so this is a view
+                    data[col] = pd.Categorical.from_codes(
+                        arr[i],
+                        dtype=pd.CategoricalDtype(block["categories"][i]),
+                        validate=False,
+                    )
+                else:
+                    data[col] = arr[i]
+
+        ordered = {col: data[col] for col in self.spec["columns"]}
+        return pd.DataFrame(ordered, index=pd.RangeIndex(nrows), copy=False)
+
+    def column(self, name):
+        """Return a read-only NumPy view of a single column."""
+        return self.frame[name].to_numpy()
+
+    def close(self):
+        """Release the mapping; the owner also unlinks the segment."""
+        if self._shm is None:
+            return
+        name = self._shm.name
+        self.frame = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # Views handed out from `frame` are still alive; the mapping goes
+            # away with them, but the owner can unlink the name regardless
+            pass
+        if self.owner:
+            self._shm.unlink()
+            _OWNED_SEGMENTS.pop(name, None)
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __reduce__(self):
+        # Only the metadata travels to workers; they re-attach by name
+        return (attach_frame, (self.spec,))
+
+
+def publish_frame(df, name=None):
+    """
+    Copy a DataFrame once into shared memory for use by worker processes.
+
+    Parameters:
+    -----------
+    df : DataFrame
+        Data to publish (e.g. output of load_wealth_data or load_covid_data)
+    name : str, optional
+        Shared-memory segment name (a random one is generated by default)
+
+    Returns:
+    --------
+    SharedDataset
+        Owning handle; pass `handle.spec` (or the handle itself) to workers
+    """
+    nrows = len(df)
+    blocks = _column_blocks(df)
+
+    # Lay out blocks back to back, each aligned to 64 bytes
+    offset = 0
+    for block in blocks:
+        offset = -(-offset // 64) * 64
+        block["offset"] = offset
+        offset += len(block["columns"]) * nrows * np.dtype(block["dtype"]).itemsize
+
+    name = name or f"cwd_{uuid.uuid4().hex[:16]}"
+    shm = shared_memory.SharedMemory(name=name, create=True, size=max(offset, 1))
+    _OWNED_SEGMENTS[shm.name] = shm
+
+    for block in blocks:
+        target = np.ndarray(
+            (len(block["columns"]), nrows),
+            dtype=np.dtype(block["dtype"]),
+            buffer=shm.buf,
+            offset=block["offset"],
+        )
+        for i, values in enumerate(block.pop("values")):
+            target[i] = values
+
+    spec = {
+        "name": shm.name,
+        "nrows": nrows,
+        "columns": list(df.columns),
+        "blocks": blocks,
+    }
+    return SharedDataset(shm, spec, owner=True)
+
+
+def attach_frame(spec):
+    """
+    Attach to a DataFrame published by publish_frame(), without copying.
+
+    Parameters:
+    -----------
+    spec : dict
+        Metadata from the publishing handle (`SharedDataset.spec`)
+
+    Returns:
+    --------
+    SharedDataset
+        Non-owning handle whose `frame` holds read-only views
+    """
+    try:
+        # Python 3.13+: keep the attaching side out of the resource tracker
+        shm = shared_memory.SharedMemory(name=spec["name"], track=False)
+    except TypeError:
+        # Older versions register on attach too; multiprocessing workers share
+        # the owner's tracker, so this is a no-op and the owner still unlinks
+        shm = shared_memory.SharedMemory(name=spec["name"])
+    handle = SharedDataset(shm, spec, owner=False)
+    atexit.register(handle.close)
+    return handle
+
+
+def publish_datasets(df_wealth=None, df_covid=None):
+    """
+    Publish the wealth and COVID-19 datasets for a parallel run.
+
+    Loads the datasets with the default loaders when they are not given.
+
+    Returns:
+    --------
+    dict
+        {'wealth': SharedDataset, 'covid': SharedDataset} owning handles
+    """
+    if df_wealth is None:
+        df_wealth = load_wealth_data()
+    if df_covid is None:
+        df_covid = load_covid_data()
+    return {"wealth": publish_frame(df_wealth), "covid": publish_frame(df_covid)}
+
+
+def attach_datasets(specs):
+    """
+    Attach to datasets published by publish_datasets() from a worker.
+
+    Parameters:
+    -----------
+    specs : dict
+        Mapping of dataset name to spec dict or SharedDataset handle
+
+    Returns:
+    --------
+    dict
+        Dataset name to read-only DataFrame
+    """
+    frames = {}
+    for key, spec in specs.items():
+        if isinstance(spec, SharedDataset):
+            spec = spec.spec
+        frames[key] = attach_frame(spec).frame
+    return frames
+
+
+@atexit.register
+def _cleanup_owned_segments():
+    """Unlink every segment this process published and did not close."""
+    if os.getpid() != _OWNER_PID:
+        # Forked workers inherit the registry but must not unlink
+        return
+    for shm in list(_OWNED_SEGMENTS.values()):
+        try:
+            shm.close()
+        except BufferError:
+            pass
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+    _OWNED_SEGMENTS.clear()
@@ -0,0 +1,238 @@
+"""Similarity of COVID-19 wave shapes across all ECDC territories."""
+
+import numpy as np
+import pandas as pd
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
+from .data_loader import period_end_dates
+
+DISTANCE_METHODS = ("correlation", "euclidean", "dtw")
+
+
+def wave_curves(df_c, countries=None, freq="W", column="cases", normalize="zscore"):
+    """
+    Per-capita case (or death) curves of every territory on a common axis.
+
+    Parameters:
+    -----------
+    df_c : DataFrame
+        Raw COVID-19 data with daily records (load_covid_data output)
+    countries : list, optional
+        Country names to include (defaults to all territories)
+    freq : str, default='W'
+        'D' for daily values, or 'W'/'M' for period sums
+    column : str, default='cases'
+        'cases' or 'deaths'
+    normalize : str or None, default='zscore'
+        'zscore' compares shapes only, 'max' scales each peak to 1,
+        None keeps counts per 100k
+
+    Returns:
+    --------
+    DataFrame
+        Dates x countries; periods without reports count as zero
+    """
+    if countries is not None:
+        df_c = df_c[df_c["countriesAndTerritories"].isin(countries)]
+    per_100k = df_c[column] / df_c["popData2020"] * 100000
+
+    dates = df_c["date"].to_numpy(dtype="datetime64[D]")
+    if freq != "D":
+        dates = period_end_dates(dates, freq)
+    curves = (
+        per_100k.groupby([pd.DatetimeIndex(dates, name="date"), df_c["countriesAndTerritories"]])
+        .sum()
+        .unstack(fill_value=0.0)
+    )
+    if freq == "D":
+        curves = curves.asfreq("D", fill_value=0.0)
+    curves.columns.name = None
+
+    values = curves.to_numpy(dtype="float64")
+    if normalize == "zscore":
+        std = values.std(axis=0)
+        values = (values - values.mean(axis=0)) / np.where(std > 0, std, 1.0)
+    elif normalize == "max":
+        peak = np.abs(values).max(axis=0)
+        values = values / np.where(peak > 0, peak, 1.0)
+    elif normalize is not None:
+        raise ValueError(f"Unknown normalize: {normalize}")
+    return pd.DataFrame(values, index=curves.index, columns=curves.columns)
+
+
+def _default_window(n_times):
+    """Sakoe-Chiba band of 10% of the series length."""
+    return max(1, int(round(0.1 * n_times)))
+
+
+def _dtw(a, b, window, limit=None):
+    """
+    Banded DTW distance between the rows of a and b, all pairs at once.
+
+    The cost matrix is filled one anti-diagonal at a time: cells on an
+    anti-diagonal only depend on the two previous ones, so each step is a
+    single vectorized update over all pairs and band cells.
+
+    Parameters:
+    -----------
+    a, b : ndarray
+        Series pairs, both shaped (n_pairs, n_times)
+    window : int
+        Maximum time shift |i - j|
+    limit : float, optional
+        Pairs whose distance provably exceeds this are abandoned (inf)
+
+    Returns:
+    --------
+    ndarray
+        Distances (square root of the summed squared differences on the
+        optimal warping path), shape (n_pairs,)
+    """
+    n_pairs, n = a.shape
+    # Anti-diagonals d = i + j indexed by i; D[0, 0] = 0 starts the recursion
+    before_last = np.full((n_pairs, n + 1), np.inf)
+    before_last[:, 0] = 0.0
+    last = np.full((n_pairs, n + 1), np.inf)
+    alive = np.arange(n_pairs)
+    result = np.full(n_pairs, np.inf)
+    bound = np.inf if limit is None else limit * limit
+
+    for d in range(2, 2 * n + 1):
+        lo = max(1, d - n, (d - window + 1) // 2)
+        hi = min(n, d - 1, (d + window) // 2)
+        current = np.full_like(last, np.inf)
+        if lo <= hi:
+            i = np.arange(lo, hi + 1)
+            cost = (a[:, i - 1] - b[:, d - i - 1]) ** 2
+            current[:, lo : hi + 1] = cost + np.minimum(
+                before_last[:, lo - 1 : hi],
+                np.minimum(last[:, lo - 1 : hi], last[:, lo : hi + 1]),
+            )
+        before_last, last = last, current
+
+        if limit is not None:
+            # A warping path visits at least one of two consecutive diagonals
+            reach = np.minimum(before_last.min(axis=1), last.min(axis=1))
+            keep = reach <= bound
+            if not keep.all():
+                alive, a, b = alive[keep], a[keep], b[keep]
+                before_last, last = before_last[keep], last[keep]
+                if not len(alive):
+                    return result
+
+    result[alive] = np.sqrt(last[:, n])
+    return result
+
+
+def _lb_keogh(query, candidates, window):
+    """LB_Keogh lower bound of the banded DTW distance, for every candidate."""
+    size = 2 * window + 1
+    upper = maximum_filter1d(candidates, size=size, axis=1, mode="nearest")
+    lower = minimum_filter1d(candidates, size=size, axis=1, mode="nearest")
+    excess = np.where(query > upper, query - upper, np.where(query < lower, query - lower, 0.0))
+    return np.sqrt((excess * excess).sum(axis=1))
+
+
+def pairwise_distances(curves, method="correlation", window=None):
+    """
+    Full distance matrix between all countries' curves.
+
+    Correlation and Euclidean distances come from one Gram matrix; DTW is
+    computed for all pairs together, one anti-diagonal at a time.
+
+    Parameters:
+    -----------
+    curves : DataFrame
+        Output of wave_curves()
+    method : str, default='correlation'
+        'correlation' (1 - Pearson r), 'euclidean' or 'dtw'
+    window : int, optional
+        DTW band in periods (defaults to 10% of the series length)
+
+    Returns:
+    --------
+    DataFrame
+        Symmetric countries x countries distance matrix
+    """
+    x = curves.to_numpy(dtype="float64").T
+    names = curves.columns
+
+    if method == "correlation":
+        centered = x - x.mean(axis=1, keepdims=True)
+        norm = np.linalg.norm(centered, axis=1)
+        norm[norm == 0] = 1.0
+        dist = 1 - (centered @ centered.T) / np.outer(norm, norm)
+    elif method == "euclidean":
+        sq = (x * x).sum(axis=1)
+        dist = np.sqrt(np.maximum(sq[:, None] + sq[None, :] - 2 * x @ x.T, 0))
+    elif method == "dtw":
+        window = _default_window(x.shape[1]) if window is None else window
+        i, j = np.triu_indices(len(x), k=1)
+        dist = np.zeros((len(x), len(x)))
+        dist[i, j] = dist[j, i] = _dtw(x[i], x[j], window)
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+    np.fill_diagonal(dist, 0.0)
+    return pd.DataFrame(dist, index=names, columns=names)
+
+
+def nearest_countries(curves, country, k=5, method="dtw", window=None, batch_size=8):
+    """
+    Countries whose waves are most similar to a chosen one.
+
+    For DTW, candidates are visited in order of their LB_Keogh lower bound;
+    the search stops once the next bound exceeds the current k-th distance,
+    and DTW computations are abandoned as soon as they cannot make the top k.
+
+    Parameters:
+    -----------
+    curves : DataFrame
+        Output of wave_curves()
+    country : str
+        Reference country name
+    k : int, default=5
+        Number of neighbours
+    method : str, default='dtw'
+        'correlation', 'euclidean' or 'dtw'
+    window : int, optional
+        DTW band in periods (defaults to 10% of the series length)
+    batch_size : int, default=8
+        Candidates evaluated together per DTW batch
+
+    Returns:
+    --------
+    DataFrame
+        Columns country and distance, nearest first; attrs['dtw_evaluated']
+        counts the exact DTW computations performed
+    """
+    others = [c for c in curves.columns if c != country]
+    k = min(k, len(others))
+
+    if method != "dtw":
+        dist = pairwise_distances(curves[[country] + others], method).iloc[0, 1:]
+        top = dist.nsmallest(k)
+        return pd.DataFrame({"country": top.index, "distance": top.to_numpy()})
+
+    query = curves[country].to_numpy(dtype="float64")
+    candidates = curves[others].to_numpy(dtype="float64").T
+    window = _default_window(len(query)) if window is None else window
+
+    bounds = _lb_keogh(query, candidates, window)
+    order = np.argsort(bounds)
+    best = np.full(len(others), np.inf)
+    evaluated = 0
+
+    for start in range(0, len(order), batch_size):
+        kth = np.sort(best)[k - 1]
+        batch = order[start : start + batch_size]
+        batch = batch[bounds[batch] < kth]
+        if not len(batch):
+            break
+        queries = np.broadcast_to(query, (len(batch), len(query)))
+        best[batch] = _dtw(queries, candidates[batch], window, None if np.isinf(kth) else kth)
+        evaluated += len(batch)
+
+    top = np.argsort(best)[:k]
+    result = pd.DataFrame({"country": np.asarray(others)[top], "distance": best[top]})
+    result.attrs["dtw_evaluated"] = evaluated
+    return result
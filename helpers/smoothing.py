@@ -0,0 +1,182 @@
+"""Holt linear and damped-trend exponential smoothing, fitted for many series at once."""
+
+import numpy as np
+import pandas as pd
+from .data_loader import stack_wealth_metrics, unstack_predictions
+
+# Smoothing parameter grids searched for every series simultaneously
+ALPHA_GRID = np.linspace(0.05, 0.95, 19)
+BETA_GRID = np.linspace(0.05, 0.95, 19)
+PHI_GRID = np.array([0.8, 0.85, 0.9, 0.95, 0.98])
+
+
+def _run_recursions(y, alpha, beta, phi):
+    """
+    Run the Holt recursions for every (parameter set, series) pair.
+
+    Parameters:
+    -----------
+    y : ndarray
+        Series on rows, time on columns: (n_series, n_times), NaN when missing
+    alpha, beta, phi : ndarray
+        Parameter sets, each shaped (n_sets, 1)
+
+    Returns:
+    --------
+    tuple
+        (sse, level, trend), each shaped (n_sets, n_series), with level and
+        trend the states at the last time step
+    """
+    n_series, n_times = y.shape
+    observed = ~np.isnan(y)
+    has_data = observed.any(axis=1)
+
+    # Initial level at the first observation, trend from the first difference
+    first = np.where(has_data, observed.argmax(axis=1), n_times)
+    rows = np.arange(n_series)
+    y0 = np.where(has_data, y[rows, np.minimum(first, n_times - 1)], np.nan)
+    nxt = np.minimum(first + 1, n_times - 1)
+    b0 = np.nan_to_num(y[rows, nxt] - y0)
+
+    shape = (alpha.shape[0], n_series)
+    level = np.broadcast_to(y0, shape).copy()
+    trend = np.broadcast_to(b0, shape).copy()
+    sse = np.zeros(shape)
+
+    # Every time step updates all series and parameter sets together
+    for t in range(n_times):
+        active = t > first
+        if not active.any():
+            continue
+        y_t = y[:, t]
+        damped_trend = phi * trend
+        forecast = level + damped_trend
+        seen = active & observed[:, t]
+
+        error = np.where(seen, y_t - forecast, 0.0)
+        sse += error * error
+        new_level = np.where(seen, forecast + alpha * error, forecast)
+        new_trend = np.where(
+            seen, beta * (new_level - level) + (1 - beta) * damped_trend, damped_trend
+        )
+        level = np.where(active, new_level, level)
+        trend = np.where(active, new_trend, trend)
+
+    return sse, level, trend
+
+
+def fit_holt(y, damped=False):
+    """
+    Fit Holt (optionally damped-trend) smoothing to every row of an array.
+
+    The parameter grid and all series are evaluated in the same recursion;
+    each series keeps the parameter set with the lowest one-step-ahead SSE.
+
+    Parameters:
+    -----------
+    y : ndarray
+        Series on rows, time on columns: (n_series, n_times), NaN when missing
+        (leading and trailing gaps are allowed)
+    damped : bool, default=False
+        Search the damping factor phi instead of fixing it at 1
+
+    Returns:
+    --------
+    dict
+        Per-series arrays: alpha, beta, phi, level and trend (final states)
+        and sse; series with fewer than two observations are NaN
+    """
+    phis = PHI_GRID if damped else np.array([1.0])
+    alpha, beta, phi = (
+        g.ravel() for g in np.meshgrid(ALPHA_GRID, BETA_GRID, phis, indexing="ij")
+    )
+    y = np.asarray(y, dtype="float64")
+    sse, level, trend = _run_recursions(y, alpha[:, None], beta[:, None], phi[:, None])
+
+    best = np.argmin(sse, axis=0)
+    series = np.arange(y.shape[0])
+    enough = (~np.isnan(y)).sum(axis=1) >= 2
+
+    def pick(a):
+        chosen = a[best] if a.ndim == 1 else a[best, series]
+        return np.where(enough, chosen, np.nan)
+
+    return {
+        "alpha": pick(alpha),
+        "beta": pick(beta),
+        "phi": pick(phi),
+        "level": pick(level),
+        "trend": pick(trend),
+        "sse": pick(sse),
+    }
+
+
+def forecast_holt(params, horizons):
+    """
+    Forecast fitted series at the given horizons.
+
+    Parameters:
+    -----------
+    params : dict
+        Output of fit_holt()
+    horizons : array-like of int
+        Steps ahead of the last time step (0 returns the final level)
+
+    Returns:
+    --------
+    ndarray
+        Forecasts shaped (n_series, n_horizons)
+    """
+    h = np.asarray(horizons, dtype="float64")[None, :]
+    phi = params["phi"][:, None]
+    # Sum of phi^1..phi^h, which is h for an undamped trend
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = np.where(phi == 1.0, h, phi * (1 - phi**h) / (1 - phi))
+    return params["level"][:, None] + factor * params["trend"][:, None]
+
+
+def _quarter_steps(train_dates, test_dates):
+    """Number of sampling steps from the last training date to each test date."""
+
+    def months(dates):
+        index = pd.DatetimeIndex(dates)
+        return index.year.to_numpy() * 12 + index.month.to_numpy()
+
+    train_months = months(train_dates)
+    step = np.median(np.diff(train_months)) if len(train_months) > 1 else 3
+    steps = np.rint((months(test_dates) - train_months[-1]) / step)
+    return np.maximum(steps, 0).astype(int)
+
+
+def train_predict_smoothing(train_df, test_df, country_codes=None, metrics=None, damped=False):
+    """
+    Holt or damped-trend forecasts for all countries and metrics at once.
+
+    Parameters:
+    -----------
+    train_df : DataFrame
+        Training data with a DATE column
+    test_df : DataFrame
+        Test data with a DATE column
+    country_codes : list, optional
+        Country codes (defaults to all configured countries)
+    metrics : list, optional
+        Metric keys from WEALTH_METRICS (defaults to all)
+    damped : bool, default=False
+        Use the damped-trend variant
+
+    Returns:
+    --------
+    dict
+        Country code -> {metric key: predicted values for test_df rows},
+        the format of train_predict_country()
+    """
+    train_dates, codes, metrics, values = stack_wealth_metrics(train_df, country_codes, metrics)
+    test_dates = np.sort(test_df["DATE"].to_numpy(dtype="datetime64[ns]"))
+
+    # (country * metric, date) series array
+    y = values.transpose(0, 2, 1).reshape(-1, len(train_dates))
+    params = fit_holt(y, damped=damped)
+    forecasts = forecast_holt(params, _quarter_steps(train_dates, test_dates))
+    forecasts = forecasts.reshape(len(codes), len(metrics), len(test_dates))
+    return unstack_predictions(forecasts, codes, metrics)
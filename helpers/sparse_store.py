@@ -0,0 +1,205 @@
+"""Span-based storage for wealth series with staggered start dates."""
+
+import numpy as np
+import pandas as pd
+
+
+class SpanFrame:
+    """
+    Wealth series stored as their populated spans only.
+
+    The DWA extract is dense on the date axis but each country's series only
+    begins once its statistics are published, so a float64 frame carries long
+    NaN runs. Here every series keeps the index range of its first and last
+    valid observation, and only that span is stored, contiguously, in one
+    shared float64 buffer. Date-range restriction is zero-copy (offsets are
+    shifted, the buffer is shared).
+
+    Column access (`frame[col]`, `frame[[...]]`) returns dense pandas objects
+    so existing helpers keep working; `span(col)` gives the compact view.
+    """
+
+    def __init__(self, dates, origin, columns, starts, lengths, offsets, gaps, values):
+        self.dates = dates
+        self.origin = origin
+        self.columns = list(columns)
+        self._index = {col: i for i, col in enumerate(self.columns)}
+        self._starts = starts
+        self._lengths = lengths
+        self._offsets = offsets
+        self._gaps = gaps
+        self._values = values
+
+    @classmethod
+    def from_frame(cls, df, date_col="DATE", columns=None):
+        """
+        Build a SpanFrame from a dense wealth DataFrame.
+
+        Parameters:
+        -----------
+        df : DataFrame
+            Wealth data with a parsed date column (load_wealth_data output)
+        date_col : str, default='DATE'
+            Name of the date column
+        columns : list, optional
+            Numeric columns to keep (defaults to all numeric columns)
+
+        Returns:
+        --------
+        SpanFrame
+        """
+        df = df.sort_values(date_col)
+        dates = df[date_col].to_numpy(dtype="datetime64[ns]")
+        if columns is None:
+            columns = [
+                c
+                for c in df.select_dtypes("number").columns
+                if c not in (date_col, "days_since_start")
+            ]
+
+        dense = df[columns].to_numpy(dtype="float64")
+        valid = ~np.isnan(dense)
+        has_any = valid.any(axis=0)
+        n = len(dates)
+
+        # First and last valid row of every column, computed column-wise at once
+        starts = np.where(has_any, valid.argmax(axis=0), 0)
+        stops = np.where(has_any, n - valid[::-1].argmax(axis=0), 0)
+        lengths = stops - starts
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype("int64")
+
+        values = np.empty(int(lengths.sum()), dtype="float64")
+        gaps = np.zeros(len(columns), dtype=bool)
+        for i in range(len(columns)):
+            span = dense[starts[i] : stops[i], i]
+            values[offsets[i] : offsets[i] + lengths[i]] = span
+            gaps[i] = lengths[i] != valid[:, i].sum()
+
+        origin = dates[0] if n else np.datetime64("NaT", "ns")
+        return cls(dates, origin, columns, starts, lengths, offsets, gaps, values)
+
+    @property
+    def nbytes(self):
+        """Bytes used by the stored spans and the date axis."""
+        return self._values.nbytes + self.dates.nbytes
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def days_since_start(self):
+        """Days elapsed since the frame origin, for every date on the axis."""
+        return (self.dates - self.origin).astype("timedelta64[D]").astype("int64")
+
+    def valid_range(self, col):
+        """Return (first, last) date with an observation, or (None, None)."""
+        i = self._index[col]
+        if self._lengths[i] == 0:
+            return None, None
+        start = self._starts[i]
+        return self.dates[start], self.dates[start + self._lengths[i] - 1]
+
+    def span(self, col, dropna=True):
+        """
+        Return the populated span of a series without copying.
+
+        Parameters:
+        -----------
+        col : str
+            Column name
+        dropna : bool, default=True
+            Remove interior gaps (only costs a mask when the span has any)
+
+        Returns:
+        --------
+        tuple
+            (days_since_start, values) arrays covering the valid range
+        """
+        i = self._index[col]
+        start, length, offset = self._starts[i], self._lengths[i], self._offsets[i]
+        values = self._values[offset : offset + length]
+        days = self.days_since_start[start : start + length]
+        if dropna and self._gaps[i]:
+            mask = ~np.isnan(values)
+            return days[mask], values[mask]
+        return days, values
+
+    def between(self, start_date=None, end_date=None, closed="both", reset_origin=False):
+        """
+        Restrict every series to a date range, sharing the underlying buffer.
+
+        Parameters:
+        -----------
+        start_date, end_date : str or Timestamp, optional
+            Range bounds (open-ended when None)
+        closed : str, default='both'
+            'both' includes end_date, 'left' excludes it
+        reset_origin : bool, default=False
+            Count days_since_start from the new first date
+
+        Returns:
+        --------
+        SpanFrame
+        """
+        lo = 0
+        hi = len(self.dates)
+        if start_date is not None:
+            lo = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start_date)), "left")
+        if end_date is not None:
+            side = "right" if closed == "both" else "left"
+            hi = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end_date)), side)
+        hi = max(hi, lo)
+
+        new_start = np.clip(self._starts, lo, hi)
+        new_stop = np.clip(self._starts + self._lengths, lo, hi)
+        offsets = self._offsets + (new_start - self._starts)
+        lengths = new_stop - new_start
+
+        dates = self.dates[lo:hi]
+        origin = self.origin
+        if reset_origin and len(dates):
+            origin = dates[0]
+        return SpanFrame(
+            dates,
+            origin,
+            self.columns,
+            new_start - lo,
+            lengths,
+            offsets,
+            self._gaps.copy(),
+            self._values,
+        )
+
+    def column(self, col):
+        """Materialize one series on the full date axis (NaN outside its span)."""
+        i = self._index[col]
+        out = np.full(len(self.dates), np.nan)
+        start, length, offset = self._starts[i], self._lengths[i], self._offsets[i]
+        out[start : start + length] = self._values[offset : offset + length]
+        return out
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key == "DATE":
+                return pd.Series(self.dates, name="DATE")
+            if key == "days_since_start":
+                return pd.Series(self.days_since_start, name=key)
+            return pd.Series(self.column(key), name=key)
+        return self.to_frame(key)
+
+    def to_frame(self, columns=None):
+        """
+        Materialize a dense DataFrame, as filter_wealth_data would return.
+
+        Parameters:
+        -----------
+        columns : list, optional
+            Columns to include (defaults to all); 'DATE' and
+            'days_since_start' are always available
+        """
+        if columns is None:
+            columns = ["DATE", "days_since_start"] + self.columns
+        data = {}
+        for col in columns:
+            data[col] = self[col].to_numpy()
+        return pd.DataFrame(data)
@@ -0,0 +1,125 @@
+"""Structural-break (change-point) scan of wealth series."""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from .data_loader import stack_wealth_metrics, years_since
+
+
+def _segment_ssr(n, st, stt, sy, sty, syy):
+    """
+    Residual sum of squares of a linear trend fit from its sufficient statistics.
+
+    All arguments are arrays of the same shape holding n, sum(t), sum(t^2),
+    sum(y), sum(t*y) and sum(y^2) of a segment; the 2x2 normal equations are
+    solved in closed form, so any number of segments is evaluated at once.
+    """
+    det = n * stt - st * st
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (n * sty - st * sy) / det
+        intercept = (sy - slope * st) / n
+    ssr = syy - intercept * sy - slope * sty
+    return np.where(det > 0, np.maximum(ssr, 0.0), np.nan)
+
+
+def scan_breaks(df, country_codes=None, metrics=None, min_size=4, return_curves=False):
+    """
+    Estimate a trend break date for every wealth series with a Chow-type scan.
+
+    Each series is modelled as a linear trend in time. Every candidate quarter
+    splits the sample in two; the candidate with the largest Chow F statistic
+    (equivalently the lowest split SSR) is the estimated break date. Prefix
+    sums of the regression statistics make each candidate an O(1) update,
+    for all series at once, instead of two full refits.
+
+    Parameters:
+    -----------
+    df : DataFrame
+        Wealth data with a DATE column
+    country_codes : list, optional
+        Country codes (defaults to all configured countries)
+    metrics : list, optional
+        Metric keys from WEALTH_METRICS (defaults to all)
+    min_size : int, default=4
+        Minimum number of observations on each side of a break
+    return_curves : bool, default=False
+        Also return the F statistic of every candidate date
+
+    Returns:
+    --------
+    DataFrame
+        One row per (country, metric) with break_date, sup_f, p_value, n_obs.
+        The p-value is the nominal F(2, n-4) tail probability at the chosen
+        date and overstates significance since the date is estimated
+        (Andrews' 5% critical value for sup-F with 15% trimming is about 5.9).
+    DataFrame, optional
+        F statistic curves (dates x series), when return_curves is True
+    """
+    dates, codes, metrics, values = stack_wealth_metrics(df, country_codes, metrics)
+
+    # Series on rows, time on columns: (n_series, n_dates)
+    y = values.transpose(0, 2, 1).reshape(-1, len(dates))
+    w = (~np.isnan(y)).astype("float64")
+    # F statistics are invariant to rescaling y; standardizing keeps the
+    # sum-of-squares differences well conditioned for EUR-level series
+    with np.errstate(invalid="ignore"):
+        y = (y - np.nanmean(y, axis=1, keepdims=True)) / np.nanstd(y, axis=1, keepdims=True)
+    y = np.nan_to_num(y)
+    t = years_since(dates, dates[0])
+    t = t - t.mean()
+    t = np.broadcast_to(t, y.shape)
+
+    # Prefix sums with a leading zero: stats of rows [0, k) are cum[:, k]
+    def prefix(a):
+        out = np.zeros((a.shape[0], a.shape[1] + 1))
+        np.cumsum(a, axis=1, out=out[:, 1:])
+        return out
+
+    cum = [
+        prefix(w),
+        prefix(w * t),
+        prefix(w * t * t),
+        prefix(w * y),
+        prefix(w * t * y),
+        prefix(w * y * y),
+    ]
+    total = [c[:, -1:] for c in cum]
+
+    # Candidate k puts observations [0, k) before the break and [k, T) after
+    before = [c[:, :-1] for c in cum]
+    after = [tot - b for tot, b in zip(total, before)]
+
+    ssr_full = _segment_ssr(*total)
+    ssr_split = _segment_ssr(*before) + _segment_ssr(*after)
+    n_obs = total[0][:, 0]
+
+    valid = (before[0] >= min_size) & (after[0] >= min_size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f_stat = ((ssr_full - ssr_split) / 2) / (ssr_split / (n_obs[:, None] - 4))
+    f_stat = np.where(valid & np.isfinite(f_stat), f_stat, np.nan)
+
+    has_candidate = ~np.isnan(f_stat).all(axis=1)
+    best = np.argmax(np.where(np.isnan(f_stat), -np.inf, f_stat), axis=1)
+    sup_f = np.where(has_candidate, f_stat[np.arange(len(best)), best], np.nan)
+    p_value = np.where(has_candidate, stats.f.sf(sup_f, 2, n_obs - 4), np.nan)
+
+    labels = [(code, metric) for code in codes for metric in metrics]
+    result = pd.DataFrame(
+        {
+            "country": [label[0] for label in labels],
+            "metric": [label[1] for label in labels],
+            "break_date": np.where(has_candidate, dates[best], np.datetime64("NaT")),
+            "sup_f": sup_f,
+            "p_value": p_value,
+            "n_obs": n_obs.astype(int),
+        }
+    )
+
+    if return_curves:
+        curves = pd.DataFrame(
+            f_stat.T,
+            index=pd.DatetimeIndex(dates, name="DATE"),
+            columns=pd.MultiIndex.from_tuples(labels, names=["country", "metric"]),
+        )
+        return result, curves
+    return result
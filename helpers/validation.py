@@ -0,0 +1,337 @@
+"""Declarative, column-vectorized validation of the ingested datasets."""
+
+import numpy as np
+import pandas as pd
+from .config import WEALTH_METRICS
+
+REPORT_COLUMNS = ["rule", "severity", "row", "column", "value", "message"]
+
+# Rules for the daily ECDC file. Severity 'error' rows are quarantined,
+# 'warning' rows are only reported.
+COVID_RULES = [
+    {
+        "rule": "schema",
+        "columns": {
+            "dateRep": "string",
+            "cases": "number",
+            "deaths": "number",
+            "countriesAndTerritories": "string",
+            "popData2020": "number",
+        },
+    },
+    {"rule": "unique", "columns": ["countriesAndTerritories", "dateRep"]},
+    # Missing days leave no row to quarantine; the row after a gap is flagged
+    {
+        "rule": "continuity",
+        "group": "countriesAndTerritories",
+        "date": "date",
+        "freq": "D",
+        "severity": "warning",
+    },
+    # Negative values are reporting corrections: kept, but worth knowing about
+    {"rule": "range", "column": "cases", "min": 0, "severity": "warning"},
+    {"rule": "range", "column": "deaths", "min": 0, "severity": "warning"},
+    {"rule": "range", "column": "popData2020", "min": 1},
+    {"rule": "constant", "group": "countriesAndTerritories", "column": "popData2020"},
+]
+
+
+def dataset_rules(name):
+    """Validation rules of a dataset key ('wealth' or 'covid')."""
+    return wealth_rules() if name == "wealth" else COVID_RULES
+
+
+def wealth_rules(country_codes=None, tolerance=0.01):
+    """
+    Build the validation rules for the DWA extract from WEALTH_METRICS.
+
+    Parameters:
+    -----------
+    country_codes : list, optional
+        Country codes (defaults to all configured countries)
+    tolerance : float, default=0.01
+        Relative slack allowed in accounting identities
+
+    Returns:
+    --------
+    list
+        Rule dictionaries for validate()
+    """
+    rules = [
+        {"rule": "schema", "columns": {"DATE": "datetime"}},
+        {"rule": "unique", "columns": ["DATE"]},
+        {"rule": "continuity", "date": "DATE", "freq": "Q"},
+    ]
+    codes = list(WEALTH_METRICS) if country_codes is None else country_codes
+    for code in codes:
+        m = WEALTH_METRICS[code]
+        for key in ("share_bottom50", "share_top10", "share_top5", "gini"):
+            rules.append({"rule": "range", "column": m[key], "min": 0, "max": 100})
+        rules += [
+            # Liabilities are recorded with a negative sign in the DWA
+            {"rule": "range", "column": m["total_liabilities"], "max": 0},
+            # Top 5% hold part of the top 10% share
+            {
+                "rule": "identity",
+                "lhs": [m["share_top5"]],
+                "op": "<=",
+                "rhs": [m["share_top10"]],
+                "tolerance": tolerance,
+            },
+            # Bottom half and top decile cannot exceed the whole
+            {
+                "rule": "identity",
+                "lhs": [m["share_bottom50"], m["share_top10"]],
+                "op": "<=",
+                "rhs": 100,
+                "tolerance": tolerance,
+            },
+            # Group net wealth (decile 8 is not in the extract) within the total
+            {
+                "rule": "identity",
+                "lhs": [
+                    m["net_wealth_bottom50"],
+                    m["net_wealth_d6"],
+                    m["net_wealth_d7"],
+                    m["net_wealth_d9"],
+                    m["net_wealth_top10"],
+                ],
+                "op": "<=",
+                "rhs": [m["net_wealth"]],
+                "tolerance": tolerance,
+            },
+        ]
+    return rules
+
+
+def _schema(df, rule):
+    """Missing columns and columns of the wrong kind (column-level findings)."""
+    kinds = {
+        "number": pd.api.types.is_numeric_dtype,
+        "string": lambda dtype: pd.api.types.is_string_dtype(dtype)
+        or pd.api.types.is_object_dtype(dtype),
+        "datetime": pd.api.types.is_datetime64_any_dtype,
+    }
+    findings = []
+    for column, kind in rule["columns"].items():
+        if column not in df:
+            findings.append((column, "missing column"))
+        elif not kinds[kind](df[column].dtype):
+            findings.append((column, f"expected {kind}, got {df[column].dtype}"))
+    return findings
+
+
+def _unique(df, rule):
+    columns = rule["columns"]
+    failed = df.duplicated(columns, keep="first").to_numpy()
+    return failed, columns[-1], "duplicate of an earlier row"
+
+
+def _period_ordinal(dates, freq):
+    """Integer period number of each date, consecutive for consecutive periods."""
+    dates = pd.DatetimeIndex(dates)
+    if freq == "D":
+        return dates.to_numpy(dtype="datetime64[D]").astype("int64")
+    if freq == "M":
+        return (dates.year * 12 + dates.month).to_numpy()
+    if freq == "Q":
+        return (dates.year * 4 + dates.quarter).to_numpy()
+    raise ValueError(f"Unknown frequency: {freq}")
+
+
+def _continuity(df, rule):
+    """Flag the first row after every gap in a (grouped) date sequence."""
+    date_col, group = rule["date"], rule.get("group")
+    codes = pd.factorize(df[group])[0] if group else np.zeros(len(df), dtype="int64")
+    ordinal = _period_ordinal(df[date_col].to_numpy(), rule["freq"])
+    order = np.lexsort([ordinal, codes])
+
+    step = np.diff(ordinal[order], prepend=ordinal[order][:1])
+    sorted_codes = codes[order]
+    step[1:][sorted_codes[1:] != sorted_codes[:-1]] = 1
+    step[:1] = 1
+
+    missing = np.empty(len(df), dtype="int64")
+    missing[order] = step - 1
+    return (
+        missing > 0,
+        date_col,
+        lambda rows: [f"{n} missing period(s) before" for n in missing[rows]],
+    )
+
+
+def _range(df, rule):
+    values = df[rule["column"]].to_numpy(dtype="float64")
+    failed = np.zeros(len(values), dtype=bool)
+    with np.errstate(invalid="ignore"):
+        if "min" in rule:
+            failed |= values < rule["min"]
+        if "max" in rule:
+            failed |= values > rule["max"]
+    bounds = f"[{rule.get('min', '-inf')}, {rule.get('max', 'inf')}]"
+    return failed, rule["column"], f"outside {bounds}"
+
+
+def _constant(df, rule):
+    """Values that differ from their group's most common value."""
+    column, group = rule["column"], rule["group"]
+    groups = pd.factorize(df[group])[0]
+    values, uniques = pd.factorize(df[column])
+
+    # Most frequent value code per group from the counts of (group, value) pairs
+    pairs, counts = np.unique(groups * len(uniques) + values, return_counts=True)
+    order = np.lexsort([-counts, pairs // len(uniques)])
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (pairs[order] // len(uniques))[1:] != (pairs[order] // len(uniques))[:-1]
+    modal = np.empty(groups.max() + 1, dtype="int64")
+    modal[pairs[order][first] // len(uniques)] = pairs[order][first] % len(uniques)
+
+    expected = modal[groups]
+    failed = values != expected
+    return (
+        failed,
+        column,
+        lambda rows: [f"differs from the {group} value {uniques[v]}" for v in expected[rows]],
+    )
+
+
+def _identity(df, rule):
+    """sum(lhs) <op> sum(rhs), within a relative tolerance, on complete rows."""
+
+    def side(spec):
+        if np.isscalar(spec):
+            return np.full(len(df), float(spec))
+        return df[list(spec)].to_numpy(dtype="float64").sum(axis=1)
+
+    lhs, rhs = side(rule["lhs"]), side(rule["rhs"])
+    slack = rule.get("tolerance", 0.0) * np.abs(rhs)
+    with np.errstate(invalid="ignore"):
+        if rule["op"] == "<=":
+            failed = lhs > rhs + slack
+        elif rule["op"] == "==":
+            failed = np.abs(lhs - rhs) > slack
+        else:
+            raise ValueError(f"Unknown identity operator: {rule['op']}")
+    # NaN on either side means the identity cannot be checked
+    failed &= ~(np.isnan(lhs) | np.isnan(rhs))
+    column = rule["lhs"][0] if not np.isscalar(rule["lhs"]) else rule["rhs"][0]
+    return failed, column, f"identity lhs {rule['op']} rhs violated"
+
+
+_CHECKS = {
+    "unique": _unique,
+    "continuity": _continuity,
+    "range": _range,
+    "constant": _constant,
+    "identity": _identity,
+}
+
+
+def validate(df, rules, quarantine=False):
+    """
+    Run validation rules as whole-column checks.
+
+    Rule dictionaries have a 'rule' type ('schema', 'unique', 'continuity',
+    'range', 'constant' or 'identity'), its arguments and an optional
+    'severity' ('error' by default, or 'warning').
+
+    Parameters:
+    -----------
+    df : DataFrame
+        Data to check (load_covid_data or load_wealth_data output)
+    rules : list
+        Rule dictionaries, e.g. COVID_RULES or wealth_rules()
+    quarantine : bool, default=False
+        Also split off the rows that fail an 'error' rule
+
+    Returns:
+    --------
+    DataFrame
+        Report with one row per finding: rule, severity, row (index label,
+        NaN for column-level findings), column, value and message
+    tuple, when quarantine is True
+        (clean, quarantined, report)
+    """
+    parts = []
+    bad = np.zeros(len(df), dtype=bool)
+    index = df.index.to_numpy()
+
+    for rule in rules:
+        kind = rule["rule"]
+        severity = rule.get("severity", "error")
+        if kind == "schema":
+            findings = _schema(df, rule)
+            if findings:
+                parts.append(
+                    pd.DataFrame(
+                        {
+                            "rule": kind,
+                            "severity": severity,
+                            "row": np.nan,
+                            "column": [f[0] for f in findings],
+                            "value": None,
+                            "message": [f[1] for f in findings],
+                        }
+                    )
+                )
+            continue
+
+        needed = [rule.get(k) for k in ("column", "date", "group") if rule.get(k)]
+        needed += list(rule.get("columns", []))
+        for k in ("lhs", "rhs"):
+            if k in rule and not np.isscalar(rule[k]):
+                needed += list(rule[k])
+        if any(col not in df for col in needed):
+            # Reported by the schema rule (or the metric is not in this extract)
+            continue
+
+        failed, column, message = _CHECKS[kind](df, rule)
+        if not failed.any():
+            continue
+        if severity == "error":
+            bad |= failed
+        rows = np.flatnonzero(failed)
+        parts.append(
+            pd.DataFrame(
+                {
+                    "rule": kind,
+                    "severity": severity,
+                    "row": index[rows],
+                    "column": column,
+                    "value": df[column].to_numpy()[rows],
+                    "message": message if isinstance(message, str) else message(rows),
+                }
+            )
+        )
+
+    report = (
+        pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=REPORT_COLUMNS)
+    )
+    if quarantine:
+        return df[~bad], df[bad], report
+    return report
+
+
+def summarize_report(report):
+    """
+    Count findings per rule, column and severity.
+
+    Parameters:
+    -----------
+    report : DataFrame
+        Output of validate()
+
+    Returns:
+    --------
+    DataFrame
+        Columns rule, column, severity and count, most frequent first
+    """
+    if report.empty:
+        return pd.DataFrame(columns=["rule", "column", "severity", "count"])
+    return (
+        report.groupby(["rule", "column", "severity"], dropna=False)
+        .size()
+        .rename("count")
+        .reset_index()
+        .sort_values("count", ascending=False, ignore_index=True)
+    )
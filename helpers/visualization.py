@@ -1,12 +1,92 @@
 """Visualization utilities for wealth distribution analysis."""
 
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
 import pandas as pd
 import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 from matplotlib.patches import Patch
 from .config import WEALTH_METRICS, COUNTRY_NAMES
 
 
+def grid_subplots(n_panels, ncols=3, panel_size=(6, 5), **kwargs):
+    """
+    Create a grid of subplots sized for any number of panels.
+
+    Parameters:
+    -----------
+    n_panels : int
+        Number of panels needed
+    ncols : int, default=3
+        Maximum number of columns
+    panel_size : tuple, default=(6, 5)
+        Width and height of a single panel in inches
+    **kwargs
+        Passed on to plt.subplots (e.g. sharey=True)
+
+    Returns:
+    --------
+    tuple
+        (fig, axes) with axes a flat list of length n_panels; surplus grid
+        cells are hidden
+    """
+    ncols = max(1, min(ncols, n_panels))
+    nrows = -(-n_panels // ncols)
+    fig, axes = plt.subplots(
+        nrows,
+        ncols,
+        figsize=(panel_size[0] * ncols, panel_size[1] * nrows),
+        squeeze=False,
+        **kwargs,
+    )
+    flat = axes.ravel()
+    for ax in flat[n_panels:]:
+        ax.axis("off")
+    return fig, list(flat[:n_panels])
+
+
+def add_line_collection(ax, dates, values, colors, labels=None, linewidth=2, alpha=1.0):
+    """
+    Draw many series sharing a date axis as a single LineCollection artist.
+
+    Parameters:
+    -----------
+    ax : Axes
+        Target axes
+    dates : array-like of datetime
+        Shared x values
+    values : ndarray
+        Series values shaped (n_series, n_dates); NaN gaps are skipped
+    colors : list
+        One color per series
+    labels : list, optional
+        Legend labels; returned as proxy handles
+    linewidth : float, default=2
+    alpha : float, default=1.0
+
+    Returns:
+    --------
+    list
+        Legend handles (empty without labels)
+    """
+    x = mdates.date2num(pd.DatetimeIndex(dates).to_pydatetime())
+    values = np.atleast_2d(np.asarray(values, dtype="float64"))
+    segments = [np.column_stack([x, row]) for row in values]
+
+    collection = LineCollection(segments, colors=colors, linewidths=linewidth, alpha=alpha)
+    ax.add_collection(collection)
+    ax.xaxis_date()
+    ax.autoscale_view()
+
+    if labels is None:
+        return []
+    return [
+        Line2D([], [], color=color, linewidth=linewidth, label=label)
+        for color, label in zip(colors, labels)
+    ]
+
+
 def plot_country_wealth_panels(df_slice, country_code):
     """
     Create a 2x2 panel plot showing all wealth metrics for a specific country.
@@ -333,3 +413,114 @@ def plot_dataset_summary(df, train_df, test_df):
     plt.tight_layout()
     plt.show()
 
+
+def plot_growth_incidence(gic, origin, target, basis="total"):
+    """
+    Plot growth incidence curves: wealth growth by group, one line per country.
+
+    Parameters:
+    -----------
+    gic : DataFrame
+        Output of inequality.growth_incidence()
+    origin, target : str or Timestamp
+        Period pair to display
+    basis : str, default='total'
+        'total', 'per_capita' or 'per_household'
+
+    Displays:
+    ---------
+    Growth (%) of each wealth group from poorest to richest between the two periods
+    """
+    origin, target = pd.Timestamp(origin), pd.Timestamp(target)
+    subset = gic[
+        (gic["origin"] == origin) & (gic["DATE"] == target) & (gic["basis"] == basis)
+    ]
+    groups = list(dict.fromkeys(subset["group"]))
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    for code, rows in subset.groupby("country", sort=False):
+        rows = rows.set_index("group").reindex(groups)
+        ax.plot(
+            groups,
+            rows["growth_pct"],
+            marker="o",
+            linewidth=2,
+            label=COUNTRY_NAMES.get(code, code),
+        )
+
+    ax.axhline(0, color="black", linewidth=0.8)
+    ax.set_title(
+        f"Growth Incidence: {origin:%Y-%m} to {target:%Y-%m}",
+        fontsize=14,
+        fontweight="bold",
+    )
+    ax.set_xlabel("Wealth Group (poorest to richest)")
+    ax.set_ylabel("Net Wealth Growth (%)")
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+
+    plt.tight_layout()
+    plt.show()
+
+
+def plot_fan_chart(sim, country_code, metric):
+    """
+    Plot a fan chart of simulated counterfactual wealth paths.
+
+    Parameters:
+    -----------
+    sim : DataFrame
+        Output of scenarios.simulate_scenarios()
+    country_code : str
+        Country code
+    metric : str
+        Metric key from WEALTH_METRICS
+
+    Displays:
+    ---------
+    Observed values, the fit under the actual pandemic and the 5-95% and
+    25-75% bands with the median of the scenario paths
+    """
+    rows = sim[(sim["country"] == country_code) & (sim["metric"] == metric)]
+    label = WEALTH_METRICS.get(country_code, {}).get(metric, metric)
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    ax.fill_between(
+        rows["DATE"],
+        rows["q05"],
+        rows["q95"],
+        color="tab:blue",
+        alpha=0.15,
+        label="Scenario 5-95%",
+    )
+    ax.fill_between(
+        rows["DATE"],
+        rows["q25"],
+        rows["q75"],
+        color="tab:blue",
+        alpha=0.3,
+        label="Scenario 25-75%",
+    )
+    ax.plot(rows["DATE"], rows["q50"], color="tab:blue", linewidth=2, label="Scenario median")
+    ax.plot(
+        rows["DATE"],
+        rows["fitted"],
+        color="black",
+        linestyle=":",
+        linewidth=1.5,
+        label="Fit (actual pandemic)",
+    )
+    ax.scatter(rows["DATE"], rows["observed"], color="black", s=12, label="Observed")
+
+    ax.set_title(
+        f"{COUNTRY_NAMES.get(country_code, country_code)}: {label}",
+        fontsize=14,
+        fontweight="bold",
+    )
+    ax.set_ylabel(label)
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y"))
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+
+    plt.tight_layout()
+    plt.show()
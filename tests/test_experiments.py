@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from helpers.experiments import ExperimentStore
+
+
+def test_leaderboard_ranks_missing_scores_last(tmp_path):
+    comparison = pd.DataFrame(
+        {
+            "Metric": ["gini", "gini"],
+            "Model": ["Linear", "Ridge"],
+            "MAE": [1.0, 2.0],
+            "RMSE": [1.0, 2.0],
+            "R²": [np.nan, 0.5],
+        }
+    )
+    with ExperimentStore(":memory:") as store:
+        store.log_run({"DE": comparison}, data_paths=(tmp_path / "wealth.csv", tmp_path / "covid.csv"))
+        board = store.leaderboard(score="r2")
+
+    assert board["model"].tolist() == ["Ridge", "Linear"]
+    assert board["rank"].tolist() == [1, 2]
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from helpers.config import WEALTH_METRICS
+from helpers.modeling import train_predict_panel
+
+
+def _panel_frame(dates):
+    """Linear synthetic series for every configured country and metric."""
+    years = np.arange(len(dates), dtype="float64") / 4
+    columns = {"DATE": dates}
+    for c, config in enumerate(WEALTH_METRICS.values()):
+        for m, col in enumerate(config.values()):
+            columns[col] = 100.0 * (c + 1) + (m + 1) * years
+    return pd.DataFrame(columns)
+
+
+def test_panel_skips_country_without_training_data():
+    dates = pd.date_range("2016-03-31", periods=24, freq="QE")
+    df = _panel_frame(dates)
+    train, test = df.iloc[:20].copy(), df.iloc[20:]
+    train[WEALTH_METRICS["DE"]["gini"]] = np.nan
+
+    preds = train_predict_panel(train, test, metrics=["gini"])
+
+    assert "gini" not in preds["DE"]
+    others = [code for code in WEALTH_METRICS if code != "DE" and "gini" in WEALTH_METRICS[code]]
+    assert others and all("gini" in preds[code] for code in others)
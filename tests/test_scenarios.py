@@ -0,0 +1,20 @@
+import numpy as np
+
+from helpers.scenarios import _draw
+
+
+def test_shift_range_draws_every_whole_quarter():
+    rng = np.random.default_rng(0)
+    lags = _draw((-2, 2), rng, 50000, integer=True)
+
+    values, counts = np.unique(lags, return_counts=True)
+    assert values.tolist() == [-2, -1, 0, 1, 2]
+    assert np.allclose(counts / len(lags), 0.2, atol=0.01)
+
+
+def test_scale_range_stays_continuous():
+    rng = np.random.default_rng(0)
+    factors = _draw((0.5, 1.5), rng, 1000)
+
+    assert factors.min() >= 0.5 and factors.max() < 1.5
+    assert len(np.unique(factors)) == len(factors)